@@ -1,3 +1,6 @@
+from widgets.pipeline import map_stage, filter_stage
+
+
 def filter_latency(data):
     """
     Processes data before it is displayed in the widget.
@@ -27,3 +30,42 @@ def table_data(data):
         return [item for item in data if item.get("latency", 0) >= 0]
     else:
         return data
+
+
+# Pipeline stages: list them under `results-handler` to compose a handler, e.g.
+#   results-handler: ["handlers.scale(1000)", "handlers.below(100)", "handlers.round_to(2)"]
+# Consecutive stages are fused into a single pass over the data.
+
+def _field(item, field):
+    """Return the value a stage works on: the item itself or one of its fields."""
+    return item.get(field, 0) if field is not None else item
+
+
+@map_stage
+def scale(item, factor, field=None):
+    """Multiply a value (or a row field) by a factor, e.g. seconds to ms."""
+    if field is None:
+        return item * factor
+    return {**item, field: item.get(field, 0) * factor}
+
+
+@map_stage
+def round_to(item, digits=2, field=None):
+    """Round a value (or a row field) to a number of digits."""
+    if field is None:
+        return round(item, digits)
+    return {**item, field: round(item.get(field, 0), digits)}
+
+
+@filter_stage
+def below(item, limit, field=None):
+    """Keep values (or rows whose field is) strictly below a limit, e.g. to drop outliers."""
+    value = _field(item, field)
+    return value is not None and value < limit
+
+
+@filter_stage
+def at_least(item, minimum, field=None):
+    """Keep values (or rows whose field is) greater than or equal to a minimum."""
+    value = _field(item, field)
+    return value is not None and value >= minimum
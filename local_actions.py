@@ -1,4 +1,6 @@
+import json
 import random
+import urllib.request
 
 
 def get_user_data():
@@ -22,3 +24,12 @@ def get_user_data():
         {"name": "Paul", "age": str(random.randint(20, 60)), "department": "Accounting", "location": "Detroit", "years": "13"},
         {"name": "Quincy", "age": str(random.randint(20, 60)), "department": "Admin", "location": "Charlotte", "years": "10"}
     ]
+
+
+def get_user_page(offset, limit, base_url="http://127.0.0.1:5000"):
+    """Return one page of users from the user server, with the total count when it is reported."""
+    url = f"{base_url.rstrip('/')}/users?offset={offset}&limit={limit}"
+    with urllib.request.urlopen(url, timeout=10) as response:
+        rows = json.load(response)
+        total = response.headers.get("X-Total-Count")
+    return {"rows": rows, "total": int(total) if total is not None else None}
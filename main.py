@@ -10,6 +10,12 @@ from widgets.input import Input
 from widgets.table import Table
 from widgets.latency_chart import LatencyChartWidget
 from widgets.timer import TimerWidget
+from widgets.sparkline import Sparkline
+from widgets.scheduler import configure_scheduler
+from widgets.async_bridge import shutdown_async_bridge
+from widgets.result_cache import configure_result_cache
+from widgets.process_pool import configure_process_pool, shutdown_process_pool
+from widgets.latency_store import configure_history, shutdown_history
 
 # Widget registry
 widget_registry = {}
@@ -31,7 +37,12 @@ def create_label_widget(config):
         alignment=config.get("alignment", "center"),
         data_provider=config.get("data_provider"),
         results_handler=config.get("results-handler"),
+        thread_pool=config.get("thread_pool"),
         style=config.get("style", {}),
+        adaptive_interval=config.get("adaptive_interval", True),
+        max_interval=config.get("max_interval"),
+        cache_ttl=config.get("cache_ttl"),
+        executor=config.get("executor", "thread"),
     )
 
 
@@ -43,6 +54,7 @@ def create_button_widget(config):
         alignment=config.get("alignment", "center"),
         data_provider=config.get("data_provider"),
         results_handler=config.get("results-handler"),
+        thread_pool=config.get("thread_pool"),
     )
 
 
@@ -54,6 +66,7 @@ def create_dropdown_widget(config):
         alignment=config.get("alignment", "center"),
         data_provider=config.get("data_provider"),
         results_handler=config.get("results-handler"),
+        thread_pool=config.get("thread_pool"),
     )
 
 
@@ -62,11 +75,22 @@ def create_table_widget(config):
     return Table(
         data_provider=config.get("data_provider"),
         results_handler=config.get("results-handler"),
+        thread_pool=config.get("thread_pool"),
         columns=config.get("columns"),
+        key=config.get("key"),
+        sort=config.get("sort"),
+        filter=config.get("filter"),
+        page_provider=config.get("page_provider"),
+        page_size=config.get("page_size", 100),
+        max_pages=config.get("max_pages", 20),
         interval=config.get("interval", None),
         alignment=config.get("alignment", "center"),
         margins=config.get("margins", [0, 0, 0, 0]),
         style=config.get("style", {}),
+        adaptive_interval=config.get("adaptive_interval", True),
+        max_interval=config.get("max_interval"),
+        cache_ttl=config.get("cache_ttl"),
+        executor=config.get("executor", "thread"),
     )
 
 
@@ -74,14 +98,22 @@ def create_table_widget(config):
 def create_latency_chart_widget(config):
     return LatencyChartWidget(
         target_host=config.get("target_host"),
+        targets=config.get("targets"),
         interval=config.get("interval", 1000),
         max_x=config.get("max_points", 180),
         irregular_factor=config.get("irregular_factor", 3),
+        history=config.get("history", False),
+        show_stats=config.get("show_stats", True),
         results_handler=config.get("results-handler"),
+        thread_pool=config.get("thread_pool"),
         data_provider=config.get("data_provider"),
         alignment=config.get("alignment", "center"),
         margins=config.get("margins", [0, 0, 0, 0]),
         style=config.get("style", {}),
+        adaptive_interval=config.get("adaptive_interval", True),
+        max_interval=config.get("max_interval"),
+        cache_ttl=config.get("cache_ttl"),
+        executor=config.get("executor", "thread"),
     )
 
 
@@ -92,6 +124,27 @@ def create_timer_widget(config):
         alignment=config.get("alignment", "center"),
         data_provider=config.get("data_provider"),
         results_handler=config.get("results-handler"),
+        thread_pool=config.get("thread_pool"),
+    )
+
+
+@register_widget("sparkline")
+def create_sparkline_widget(config):
+    return Sparkline(
+        max_points=config.get("max_points", 60),
+        interval=config.get("interval", 1000),
+        min_y=config.get("min_y", 0),
+        show_value=config.get("show_value", True),
+        results_handler=config.get("results-handler"),
+        thread_pool=config.get("thread_pool"),
+        data_provider=config.get("data_provider"),
+        alignment=config.get("alignment", "center"),
+        margins=config.get("margins", [0, 0, 0, 0]),
+        style=config.get("style", {}),
+        adaptive_interval=config.get("adaptive_interval", True),
+        max_interval=config.get("max_interval"),
+        cache_ttl=config.get("cache_ttl"),
+        executor=config.get("executor", "thread"),
     )
 
 
@@ -198,11 +251,24 @@ class WidgetApp(QMainWindow):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(shutdown_async_bridge)
+    app.aboutToQuit.connect(shutdown_process_pool)
+    app.aboutToQuit.connect(shutdown_history)
 
     # Load the configuration from config.yaml
     with open("config.yaml", "r") as f:
         config = yaml.safe_load(f)
 
+    # All periodic widget updates share one scheduler
+    user_config = config.get("user_config", {})
+    configure_scheduler(jitter=user_config.get("tick_jitter", 0))
+    configure_result_cache(max_entries=user_config.get("result_cache_size", 256))
+    configure_process_pool(max_workers=user_config.get("process_pool_size"))
+    configure_history(
+        directory=user_config.get("history_dir"),
+        raw_capacity=user_config.get("history_size"),
+    )
+
     # Create a window for each widget container
     windows = []
     for container_name, container_config in config.items():
@@ -1,5 +1,13 @@
 import asyncio
 import ipaddress
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+import os
+import select
+import socket
+import struct
+import threading
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 from ping3 import ping
@@ -7,11 +15,25 @@ from scapy.all import ARP, Ether, srp
 from socket import gethostbyaddr
 import requests
 import json
-import os
+
+# Devices stop waiting for the ARP sweep this many seconds before the scan deadline
+DEADLINE_MARGIN = 0.1
 
 
 class NetworkScanner:
-    def __init__(self, subnet, data_dir="data", vendor_url=None, verbose=True):
+    def __init__(
+        self,
+        subnet,
+        data_dir="data",
+        vendor_url=None,
+        verbose=True,
+        concurrency=128,
+        ping_timeout=1,
+        arp_timeout=2,
+        name_timeout=1,
+        deadline=None,
+        sweep_arp=True,
+    ):
         """
         Initializes the NetworkScanner class.
         Args:
@@ -19,6 +41,14 @@ class NetworkScanner:
             data_dir (str): Directory to store data files.
             vendor_url (str): URL to fetch the MAC Vendor database.
             verbose (bool): Whether to enable verbose output.
+            concurrency (int): Maximum number of hosts scanned at the same time.
+            ping_timeout (float): Seconds to wait for a ping reply.
+            arp_timeout (float): Seconds to wait for an ARP reply.
+            name_timeout (float): Seconds to wait for a name lookup.
+            deadline (float): Stop the whole scan after this many seconds and return
+                the devices found so far (optional).
+            sweep_arp (bool): Resolve MAC addresses with one ARP sweep of the subnet per scan
+                instead of an ARP request per device.
         """
         self.subnet = subnet
         self.data_dir = Path(data_dir)
@@ -27,6 +57,14 @@ class NetworkScanner:
         self.vendor_url = vendor_url or "https://maclookup.app/downloads/json-database/get-db"
         self.mac_vendor_list = self.load_mac_vendor_list()
         self.verbose = verbose
+        self.concurrency = max(1, int(concurrency))
+        self.ping_timeout = ping_timeout
+        self.arp_timeout = arp_timeout
+        self.name_timeout = name_timeout
+        self.deadline = deadline
+        self.sweep_arp = sweep_arp
+        # IP -> MAC map of the last ARP sweep; None until a sweep succeeded
+        self.arp_table = None
         self.log(f"Initialized NetworkScanner for {self.subnet}")
 
     def __call__(self):
@@ -34,10 +72,11 @@ class NetworkScanner:
         Makes the class callable to execute a network scan directly.
         """
         self.log("self.call(): Starting network scan...")
-        if asyncio.get_event_loop().is_running():
-            return asyncio.create_task(self.scan_network())
-        else:
-            return asyncio.run(self.scan_network())
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self.scan_network()
+        return asyncio.create_task(self.scan_network_async())
 
     def log(self, message):
         """Logs a message if verbose mode is enabled."""
@@ -94,16 +133,44 @@ class NetworkScanner:
 
     def ping_device(self, ip):
         """Pings a device to check if it's online and measures latency."""
-        latency = self.ping3_ping(ip)
+        latency = self.ping3_ping(ip, timeout=self.ping_timeout)
         self.log(f"Pinged {ip}: {'Online' if latency else 'Offline'}")
         return ip, latency
 
-    def get_mac_address(self, ip):
-        """Retrieves the MAC address of a device using ARP packets."""
+    def arp_sweep(self, timeout=None, store=True):
+        """
+        Sends an ARP request to every address of the subnet in one batch and
+        collects all replies in a single receive window.
+
+        Args:
+            timeout (float): Receive window in seconds (defaults to `arp_timeout`).
+            store (bool): Keep the result in `arp_table`.
+
+        Returns:
+            dict: MAC address per answering IP, or None if the sweep failed.
+        """
+        timeout = self.arp_timeout if timeout is None else timeout
+        self.log(f"Sweeping {self.subnet} with ARP...")
+        try:
+            broadcast = Ether(dst="ff:ff:ff:ff:ff:ff")
+            answered_list = srp(broadcast / ARP(pdst=self.subnet), timeout=timeout, verbose=False)[0]
+        except Exception as e:
+            self.log(f"ARP sweep failed: {e}")
+            return None
+        table = {received.psrc: received.hwsrc for _, received in answered_list}
+        self.log(f"ARP sweep found {len(table)} devices")
+        if store:
+            self.arp_table = table
+        return table
+
+    def get_mac_address(self, ip, timeout=2):
+        """Retrieves the MAC address of a device, from the last ARP sweep if there was one."""
+        if self.arp_table is not None:
+            return self.arp_table.get(ip)
         try:
             arp_request = ARP(pdst=ip)
             broadcast = Ether(dst="ff:ff:ff:ff:ff:ff")
-            answered_list = srp(broadcast / arp_request, timeout=2, verbose=False)[0]
+            answered_list = srp(broadcast / arp_request, timeout=timeout, verbose=False)[0]
             for _, received in answered_list:
                 return received.hwsrc
         except Exception:
@@ -121,7 +188,7 @@ class NetworkScanner:
         self.log(f"Scanning device: {ip}")
         latency = self.ping_device(ip)
         if latency[1] is not None:
-            mac = self.get_mac_address(ip)
+            mac = self.get_mac_address(ip, timeout=self.arp_timeout)
             netbios_name = self.get_netbios_name(ip)
             result = {
                 "ip": ip,
@@ -134,14 +201,261 @@ class NetworkScanner:
             return result
         return None
 
-    def scan_network(self):
-        """Scans the network for active devices asynchronously."""
+    async def run_phase(self, executor, timeout, function, *args, default=None):
+        """Run one blocking scan step on the executor, giving up after `timeout` seconds."""
+        loop = asyncio.get_running_loop()
+        try:
+            # A little slack over the step's own timeout, so its answer can still arrive
+            return await asyncio.wait_for(loop.run_in_executor(executor, function, *args), timeout + 0.5)
+        except asyncio.TimeoutError:
+            return default
+
+    async def scan_device_async(self, ip, executor, semaphore, sweep=None, stop_at=None):
+        """
+        Scans a single device like scan_device, with each phase bounded by its own timeout.
+
+        With a running ARP sweep, the device waits for it at most until shortly
+        before `stop_at` (event-loop time of the scan deadline); if the sweep has
+        not finished by then, the device is reported with a MAC of None.
+        """
+        async with semaphore:
+            latency = await self.run_phase(executor, self.ping_timeout, self.ping3_ping, ip, self.ping_timeout)
+            if latency is None:
+                return None
+            netbios_name = await self.run_phase(
+                executor, self.name_timeout, self.get_netbios_name, ip, default="Unknown"
+            )
+        if sweep is not None and not sweep.done():
+            # Wait for the subnet's ARP sweep without holding a slot other hosts could ping with
+            timeout = None
+            if stop_at is not None:
+                timeout = max(0, stop_at - DEADLINE_MARGIN - asyncio.get_running_loop().time())
+            await asyncio.wait([sweep], timeout=timeout)
+        if sweep is not None and not sweep.done():
+            mac = None
+        elif sweep is not None and sweep.result() is not None:
+            mac = sweep.result().get(ip)
+        else:
+            async with semaphore:
+                mac = await self.run_phase(
+                    executor, self.arp_timeout, self.get_mac_address, ip, self.arp_timeout, default="Unknown"
+                )
+        result = {
+            "ip": ip,
+            "mac": mac,
+            "vendor": self.get_vendor_by_mac(mac),
+            "netbios": netbios_name,
+            "latency": latency,
+        }
+        self.log(f"Device found: {result}")
+        return result
+
+    async def iter_network_async(self):
+        """
+        Scans up to `concurrency` hosts at a time and yields active devices as
+        they are found, until every host is done or the deadline passes.
+        """
         self.log(f"Starting network scan for {self.subnet}...")
         network = ipaddress.IPv4Network(self.subnet, strict=False)
-        tasks = [self.scan_device(str(ip)) for ip in network.hosts()]
-        print(tasks)
-        # devices = await asyncio.gather(*tasks)
-        return [device for device in tasks if device]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="scan")
+        stop_at = None
+        if self.deadline is not None:
+            stop_at = asyncio.get_running_loop().time() + self.deadline
+        # One ARP sweep runs alongside the pings; devices read their MAC from its table
+        sweep = None
+        if self.sweep_arp:
+            self.arp_table = None
+            # A sweep cut short by the deadline finishes in the background; it must not
+            # update arp_table then, so the table is stored below once the scan is done
+            sweep = asyncio.get_running_loop().run_in_executor(executor, self.arp_sweep, None, False)
+        tasks = [
+            asyncio.create_task(self.scan_device_async(str(ip), executor, semaphore, sweep, stop_at))
+            for ip in network.hosts()
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks, timeout=self.deadline):
+                device = await finished
+                if device:
+                    yield device
+        except asyncio.TimeoutError:
+            self.log(f"Scan of {self.subnet} stopped at the {self.deadline} s deadline")
+        finally:
+            if sweep is not None and sweep.done() and not sweep.cancelled():
+                self.arp_table = sweep.result()
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def scan_network_async(self):
+        """Scans the network concurrently; returns the active devices in address order."""
+        devices = [device async for device in self.iter_network_async()]
+        return sorted(devices, key=lambda device: ipaddress.ip_address(device["ip"]))
+
+    def iter_network(self):
+        """Scans the network and yields active devices as they are found."""
+        # Step the async scan on a private loop, so callers on worker threads can stream it
+        loop = asyncio.new_event_loop()
+        devices = self.iter_network_async()
+        try:
+            while True:
+                try:
+                    device = loop.run_until_complete(devices.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield device
+        finally:
+            loop.run_until_complete(devices.aclose())
+            loop.close()
+
+    def scan_network(self):
+        """Scans the network for active devices."""
+        return sorted(self.iter_network(), key=lambda device: ipaddress.ip_address(device["ip"]))
+
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+
+def icmp_checksum(data):
+    """Internet checksum (RFC 1071) of an ICMP message."""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class MultiPinger:
+    PAYLOAD = b"BWidgets".ljust(56, b"\0")
+
+    def __init__(self):
+        """
+        Pings many IPv4 hosts at once over a single ICMP socket.
+
+        Every round sends one echo request per host, then waits on the one
+        socket until each request has been answered or the timeout expires,
+        matching replies by identifier and sequence number. Probing N hosts
+        therefore costs one socket and one waiting thread, not N.
+
+        An unprivileged datagram ICMP socket is used where the system allows it
+        (Linux `net.ipv4.ping_group_range`, macOS); otherwise a raw socket,
+        which needs root or CAP_NET_RAW.
+        """
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._addresses = {}
+        self.sock = None
+        self.raw = False
+        self.identifier = os.getpid() & 0xFFFF
+
+    def open(self):
+        """Open the ICMP socket (datagram if permitted, raw otherwise)."""
+        try:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            self.raw = False
+        except PermissionError:
+            try:
+                self.sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+                self.raw = True
+            except PermissionError as e:
+                raise PermissionError(
+                    "ICMP sockets need root, CAP_NET_RAW or a matching net.ipv4.ping_group_range"
+                ) from e
+        self.sock.setblocking(False)
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def resolve(self, host):
+        """Return the IPv4 address of a host (cached), or None if it does not resolve."""
+        address = self._addresses.get(host)
+        if address is None:
+            try:
+                address = self._addresses[host] = socket.gethostbyname(host)
+            except OSError:
+                return None
+        return address
+
+    def ping(self, hosts, timeout=1.0):
+        """
+        Send one echo request to every host and collect the replies.
+
+        Args:
+            hosts (list): Host names or IPv4 addresses.
+            timeout (float): Seconds to wait for the replies of this round.
+
+        Returns:
+            dict: Round-trip time in ms per host, None for hosts that did not answer.
+        """
+        results = {host: None for host in hosts}
+        with self._lock:
+            if self.sock is None:
+                self.open()
+            # sequence -> (host, address, send time)
+            pending = {}
+            for host in hosts:
+                address = self.resolve(host)
+                if address is None:
+                    continue
+                sequence = next(self._sequence) & 0xFFFF
+                header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, self.identifier, sequence)
+                checksum = icmp_checksum(header + self.PAYLOAD)
+                header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, self.identifier, sequence)
+                try:
+                    self.sock.sendto(header + self.PAYLOAD, (address, 0))
+                except OSError:
+                    continue
+                pending[sequence] = (host, address, time.perf_counter())
+
+            # The kernel replaces the identifier of datagram ICMP sockets with the socket's port
+            identifier = self.identifier if self.raw else self.sock.getsockname()[1]
+            deadline = time.perf_counter() + timeout
+            while pending:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not select.select([self.sock], [], [], remaining)[0]:
+                    break
+                while pending:
+                    try:
+                        packet, (source, _) = self.sock.recvfrom(2048)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    received = time.perf_counter()
+                    if self.raw:
+                        # Raw sockets deliver the IP header too
+                        packet = packet[(packet[0] & 0x0F) * 4:]
+                    if len(packet) < 8:
+                        continue
+                    kind, _, _, reply_id, sequence = struct.unpack("!BBHHH", packet[:8])
+                    entry = pending.get(sequence)
+                    if kind != ICMP_ECHO_REPLY or reply_id != identifier or entry is None or entry[1] != source:
+                        continue
+                    del pending[sequence]
+                    results[entry[0]] = round((received - entry[2]) * 1000, 2)
+        return results
+
+
+_pinger = None
+_pinger_lock = threading.Lock()
+
+
+def ping_many(targets, timeout=1.0):
+    """
+    Data provider pinging every target over one shared ICMP socket, e.g.
+    `data_provider: "network.ping_many(['google.com', '1.1.1.1'])"`.
+
+    Returns:
+        dict: Latency in ms per target, None for targets that did not answer.
+    """
+    global _pinger
+    with _pinger_lock:
+        if _pinger is None:
+            _pinger = MultiPinger()
+        pinger = _pinger
+    return pinger.ping(list(targets), timeout=timeout)
 
 
 async def ping3_ping(self, ip, timeout=1):
@@ -153,11 +467,14 @@ async def ping3_ping(self, ip, timeout=1):
         return None
 
 
-async def scan(subnet):
+async def scan(subnet, concurrency=128, deadline=None):
     print("Scanning network...")
-    scanner = NetworkScanner(subnet, verbose=True)
+    # Loading the vendor list blocks; keep it off the event loop so other probes keep running
+    scanner = await asyncio.to_thread(
+        NetworkScanner, subnet, verbose=True, concurrency=concurrency, deadline=deadline
+    )
 
-    result = scanner.scan_network()
+    result = await scanner.scan_network_async()
     # Check if an event loop is already running
     # if asyncio.get_event_loop().is_running():
     #     # Schedule the scan as a task and return its result
@@ -169,6 +486,12 @@ async def scan(subnet):
     return result
 
 
+def scan_stream(subnet, concurrency=128, deadline=None):
+    """Yields devices on a subnet as they are found, for incremental widget updates."""
+    scanner = NetworkScanner(subnet, verbose=True, concurrency=concurrency, deadline=deadline)
+    yield from scanner.iter_network()
+
+
 if __name__ == "__main__":
     subnet = "192.168.1.0/24"
-    devices = scan(subnet)
+    devices = asyncio.run(scan(subnet))
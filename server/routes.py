@@ -7,8 +7,19 @@ user_routes = Blueprint('user_routes', __name__)
 
 @user_routes.route('/users', methods=['GET'])
 def get_users():
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users])
+    # Optional paging: /users?offset=0&limit=100, with the total in X-Total-Count
+    offset = request.args.get('offset', type=int)
+    limit = request.args.get('limit', type=int)
+    if offset is None and limit is None:
+        users = User.query.all()
+        return jsonify([user.to_dict() for user in users])
+
+    query = User.query.order_by(User.id)
+    total = query.count()
+    users = query.offset(max(offset or 0, 0)).limit(max(limit or 100, 0)).all()
+    response = jsonify([user.to_dict() for user in users])
+    response.headers['X-Total-Count'] = str(total)
+    return response
 
 @user_routes.route('/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+
+class AsyncioBridge:
+    def __init__(self):
+        """
+        Run an asyncio event loop next to the Qt event loop.
+
+        The loop lives on a single daemon thread, so coroutine providers are
+        awaited natively and many of them (e.g. network probes) run concurrently
+        without occupying a pool thread each. Completion callbacks run on the
+        loop thread; widgets get their results back through queued Qt signals.
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="asyncio-bridge", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, awaitable, callback=None):
+        """
+        Schedule an awaitable on the bridge loop.
+
+        Args:
+            awaitable: Coroutine or other awaitable to run.
+            callback (callable): Called with the finished concurrent future (optional).
+
+        Returns:
+            concurrent.futures.Future: Future for the awaitable's result.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._await(awaitable), self.loop)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def run(self, awaitable, timeout=None):
+        """Block the calling (non-loop) thread until the awaitable completes."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncioBridge.run() cannot be called from the bridge loop")
+        return self.submit(awaitable).result(timeout)
+
+    def iterate(self, async_iterator):
+        """Consume an async iterator from a (non-loop) thread as a plain generator."""
+        while True:
+            try:
+                yield self.run(async_iterator.__anext__())
+            except StopAsyncIteration:
+                return
+
+    @staticmethod
+    async def _await(awaitable):
+        return await awaitable
+
+    def stop(self):
+        """Stop the loop and wait for its thread to exit."""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+
+
+_async_bridge = None
+_bridge_lock = threading.Lock()
+
+
+def get_async_bridge():
+    """Return the application-wide asyncio bridge, starting it on first use."""
+    global _async_bridge
+    with _bridge_lock:
+        if _async_bridge is None:
+            _async_bridge = AsyncioBridge()
+        return _async_bridge
+
+
+def shutdown_async_bridge():
+    """Stop the asyncio bridge if it was started."""
+    if _async_bridge is not None:
+        _async_bridge.stop()
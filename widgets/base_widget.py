@@ -1,28 +1,26 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt, QTimer
-import importlib
+from PySide6.QtCore import Qt, QThreadPool, QTimer, Signal
+from widgets.worker import FetchWorker
+from widgets.callables import compile_callable, resolve_callable_from_string  # noqa: F401
+from widgets.pipeline import compile_handler, handler_modules
+from widgets.provider_bus import get_provider_bus
+from widgets.scheduler import get_scheduler
+from widgets.async_bridge import get_async_bridge
+from widgets.process_pool import get_process_pool
 import inspect
-import ast
-
-
-def resolve_callable_from_string(provider_string):
-    """Parse and resolve a string into a callable and its arguments."""
-    if "(" in provider_string and provider_string.endswith(")"):
-        module_function, args_str = provider_string.split("(", 1)
-        module_name, function_name = module_function.rsplit(".", 1)
-        module = importlib.import_module(module_name)
-        function = getattr(module, function_name)
-        args_str = args_str.rstrip(")")
-        args = ast.literal_eval(f"({args_str},)") if args_str.strip() else tuple()
-        return function, args
-    else:
-        module_name, function_name = provider_string.rsplit(".", 1)
-        module = importlib.import_module(module_name)
-        function = getattr(module, function_name)
-        return function, tuple()
+import math
+import time
 
 
 class BaseWidget(QWidget):
+    # Emitted from pool threads; delivered to the GUI thread via queued connections
+    data_ready = Signal(object)
+    chunk_ready = Signal(object)
+    cached_ready = Signal(object)
+    fetch_failed = Signal(str)
+    # The provider itself returned nothing (unlike a result dropped by the results handler)
+    fetch_empty = Signal()
+
     ALIGNMENT_MAP = {
         "center": Qt.AlignCenter,
         "left": Qt.AlignLeft,
@@ -31,6 +29,13 @@ class BaseWidget(QWidget):
         "bottom": Qt.AlignBottom,
     }
 
+    # Adaptive polling: keep the period at least this many times the provider latency
+    LATENCY_HEADROOM = 1.5
+    # Default cap on how far the period may be stretched, as a multiple of `interval`
+    MAX_INTERVAL_STRETCH = 16
+
+    EXECUTORS = ("thread", "process")
+
     def __init__(
         self,
         alignment="center",
@@ -41,6 +46,11 @@ class BaseWidget(QWidget):
         text=None,
         widget_type=None,
         widget_name=None,
+        thread_pool=None,
+        adaptive_interval=True,
+        max_interval=None,
+        cache_ttl=None,
+        executor="thread",
         *args,
         **kwargs
     ):
@@ -51,11 +61,18 @@ class BaseWidget(QWidget):
             alignment (str): Alignment for the widget.
             margins (list): Margins for the widget layout.
             data_provider (str): String specifying the data-fetching function.
-            results_handler (str): String specifying the results handler function.
+            results_handler (str | list): Results handler string, or a list of stage strings
+                compiled into one pipeline.
             interval (int): Interval for periodic updates (optional).
             text (str): Fallback text if no data provider is set.
             widget_type (str): Type of the widget (e.g., "label").
             widget_name (str): Optional name of the widget.
+            thread_pool (QThreadPool): Pool used to run data providers off the GUI thread.
+            adaptive_interval (bool): Stretch the interval while the provider is slower than it.
+            max_interval (int): Upper bound in ms for the stretched interval (optional).
+            cache_ttl (int): Serve provider results from the shared cache for this many ms (optional).
+            executor (str): "thread" (default) or "process" to run provider and handler
+                in the shared process pool.
         """
         super().__init__(*args, **kwargs)
         self.data_provider = data_provider or text
@@ -64,6 +81,29 @@ class BaseWidget(QWidget):
         self.alignment = self.parse_alignment(alignment)
         self.widget_type = widget_type or "unknown"
         self.widget_name = widget_name
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self.has_data = False
+        self.streaming = False
+
+        # Polling policy: never overlap fetches, adapt the period to provider latency
+        self.adaptive_interval = adaptive_interval
+        self.max_interval = max_interval or (interval or 0) * self.MAX_INTERVAL_STRETCH
+        self.effective_interval = interval
+        self.fetch_in_flight = False
+        self.fetch_started = None
+        self.provider_latency = None
+        self.skipped_ticks = 0
+        self.cache_ttl = cache_ttl
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unsupported executor: {executor}")
+        self.executor = executor
+
+        # Results computed on pool threads come back through these signals
+        self.data_ready.connect(self.on_worker_result, Qt.QueuedConnection)
+        self.chunk_ready.connect(self.on_worker_chunk, Qt.QueuedConnection)
+        self.cached_ready.connect(self.on_cached_result, Qt.QueuedConnection)
+        self.fetch_failed.connect(self.on_worker_error, Qt.QueuedConnection)
+        self.fetch_empty.connect(self.on_fetch_empty, Qt.QueuedConnection)
 
         if margins:
             self.setContentsMargins(*margins)
@@ -79,13 +119,15 @@ class BaseWidget(QWidget):
         self.layout.addWidget(self.loading_label)
         self.hide_loading()
 
-        # Timer for periodic updates
-        self.timer = None
+        # Parse and bind the provider/handler strings once, up front
+        self.compile_callables()
+
+        # Periodic updates are driven by the application-wide tick scheduler
         if self.interval:
             self.start_periodic_updates()
 
-        # Start fetching data in the background
-        self.defer_data_fetching()
+        # Start fetching once the event loop runs, after every widget has been built
+        QTimer.singleShot(0, self.defer_data_fetching)
 
     @staticmethod
     def parse_alignment(alignment_str):
@@ -96,6 +138,33 @@ class BaseWidget(QWidget):
         """Add a child widget to the layout."""
         self.layout.addWidget(widget)
 
+    def compile_callables(self):
+        """Resolve the provider and results handler into the shared callable cache."""
+        self.provider_key = None
+        if self.data_provider:
+            try:
+                self.provider_key = compile_callable(self.data_provider).key
+            except Exception as e:
+                self.log(f"Error compiling {self.data_provider!r}: {e}")
+        if self.results_handler:
+            try:
+                compile_handler(self.results_handler)
+            except Exception as e:
+                self.log(f"Error compiling {self.results_handler!r}: {e}")
+
+        if self.executor == "process" and self.provider_key is not None:
+            if not isinstance(self.data_provider, str) or (
+                self.results_handler and not isinstance(self.results_handler, (str, list))
+            ):
+                self.log("Process executor needs string provider/handler specs; using threads.")
+                self.executor = "thread"
+                return
+            # The handler runs in the child too, so only identical pairs can share a fetch
+            self.provider_key = f"{self.provider_key}|process|{self.results_handler}"
+            get_process_pool().register_modules(handler_modules(self.data_provider))
+            if self.results_handler:
+                get_process_pool().register_modules(handler_modules(self.results_handler))
+
     def fetch_data(self):
         """Fetch data using the data provider."""
         if not self.data_provider:
@@ -103,12 +172,12 @@ class BaseWidget(QWidget):
             return None
 
         try:
-            function, args = resolve_callable_from_string(self.data_provider)
-            if inspect.iscoroutinefunction(function):
-                self.log("Data provider is asynchronous. Use async methods.")
-                return None
-            else:
-                return function(*args)
+            provider = compile_callable(self.data_provider)
+            data = provider()
+            if inspect.isawaitable(data):
+                # Coroutine providers are awaited on the asyncio bridge loop
+                data = get_async_bridge().run(data)
+            return data
         except Exception as e:
             self.log(f"Error fetching data: {e}")
             return None
@@ -119,32 +188,146 @@ class BaseWidget(QWidget):
             return data
 
         try:
-            function, args = resolve_callable_from_string(self.results_handler)
-            return function(data, *args)
+            handler = compile_handler(self.results_handler)
+            return handler(data)
         except Exception as e:
             self.log(f"Error processing results: {e}")
             return data
 
+    def fetch_and_process(self):
+        """Run the data provider and results handler (called on a pool thread)."""
+        data = self.fetch_data()
+        if data is None:
+            self.fetch_empty.emit()
+            return None
+        return self.handle_results(data)
+
     def defer_data_fetching(self):
-        """Defer data fetching to ensure UI renders immediately."""
-        def fetch_and_process():
+        """Run the data provider on the thread pool so the UI never blocks on it."""
+        if not self.data_provider:
+            return
+        if not self.has_data:
             self.show_loading()
-            data = self.fetch_data()
-            if data is not None:
-                processed_data = self.handle_results(data)
-                self.on_data_fetched(processed_data)
+        if self.provider_key is not None:
+            # Widgets sharing the same provider call share one in-flight fetch
+            if not get_provider_bus().request(self):
+                return
+        else:
+            worker = FetchWorker(self.fetch_and_process, self.data_ready, self.fetch_failed)
+            self.thread_pool.start(worker)
+        self.fetch_in_flight = True
+        self.fetch_started = time.monotonic()
+
+    def on_worker_result(self, data):
+        """Receive a processed result on the GUI thread."""
+        self.finish_fetch()
+        if self.streaming:
+            # A streamed fetch ends with an empty result
+            self.streaming = False
+            self.on_stream_finished()
+        elif data is not None:
+            self.has_data = True
+            self.on_data_fetched(data)
+
+    def on_worker_chunk(self, chunk):
+        """Receive one processed chunk of a streaming provider on the GUI thread."""
+        if not self.streaming:
+            self.streaming = True
+            self.hide_loading()
+            self.has_data = True
+            self.on_stream_started()
+        if chunk is not None:
+            self.on_data_chunk(chunk)
+
+    def on_cached_result(self, data):
+        """Receive a cached result on the GUI thread; any refresh keeps running."""
+        if data is not None:
             self.hide_loading()
+            self.has_data = True
+            self.on_data_fetched(data)
 
-        QTimer.singleShot(0, fetch_and_process)
+    def on_fetch_empty(self):
+        """Called on the GUI thread, before the result, when the provider returned nothing."""
+
+    def on_worker_error(self, message):
+        """Receive a fetch error on the GUI thread."""
+        self.finish_fetch()
+        self.log(f"Error fetching data: {message}")
+
+    def finish_fetch(self):
+        """Clear the in-flight state and feed the measured latency to the polling policy."""
+        self.hide_loading()
+        self.fetch_in_flight = False
+        if self.fetch_started is not None:
+            self.adapt_interval((time.monotonic() - self.fetch_started) * 1000)
+            self.fetch_started = None
+
+    def adapt_interval(self, latency):
+        """
+        Update the effective polling interval from a measured provider latency.
+
+        The interval grows immediately (in whole multiples of `interval`) when the
+        provider is slower than the period, and shrinks back one step per fetch
+        once it recovers.
+
+        Args:
+            latency (float): Provider latency of the last fetch in milliseconds.
+        """
+        if self.provider_latency is None:
+            self.provider_latency = latency
+        else:
+            self.provider_latency = 0.7 * self.provider_latency + 0.3 * latency
+
+        if not (self.interval and self.adaptive_interval):
+            return
+
+        steps = max(1, math.ceil(self.provider_latency * self.LATENCY_HEADROOM / self.interval))
+        current_steps = self.effective_interval // self.interval
+        if steps < current_steps:
+            steps = current_steps - 1
+        effective = max(self.interval, min(self.interval * steps, self.max_interval))
+
+        if effective != self.effective_interval:
+            self.log(
+                f"Effective interval {self.effective_interval} -> {effective} ms "
+                f"(provider latency {self.provider_latency:.0f} ms)"
+            )
+            self.effective_interval = effective
+            get_scheduler().set_interval(self.periodic_task, effective)
+
+    def polling_stats(self):
+        """Return the widget's polling state, for debugging."""
+        return {
+            "interval": self.interval,
+            "effective_interval": self.effective_interval,
+            "provider_latency": self.provider_latency,
+            "skipped_ticks": self.skipped_ticks,
+            "fetch_in_flight": self.fetch_in_flight,
+            "handler_stages": self.handler_stats(),
+        }
+
+    def handler_stats(self):
+        """Return per-stage timings of a results-handler pipeline, if one is configured."""
+        if not isinstance(self.results_handler, list):
+            return None
+        try:
+            return compile_handler(self.results_handler).stats()
+        except Exception:
+            return None
 
     def start_periodic_updates(self):
         """Start periodic updates for the widget."""
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.periodic_task)
-        self.timer.start(self.interval)
+        get_scheduler().add(self.periodic_task, self.interval, owner=self)
+
+    def stop_periodic_updates(self):
+        """Stop periodic updates for the widget."""
+        get_scheduler().remove(self.periodic_task)
 
     def periodic_task(self):
-        """Fetch and process data periodically."""
+        """Fetch and process data periodically, skipping the tick if a fetch is still running."""
+        if self.fetch_in_flight:
+            self.skipped_ticks += 1
+            return
         self.log("Running periodic task.")
         self.defer_data_fetching()
 
@@ -153,6 +336,17 @@ class BaseWidget(QWidget):
         self.log(f"Data fetched: {data}")
         # Override in subclasses to handle fetched data
 
+    def on_stream_started(self):
+        """Called before the first chunk of a streaming fetch; override to reset state."""
+
+    def on_data_chunk(self, chunk):
+        """Callback for each chunk yielded by a generator provider."""
+        # By default every chunk is treated like a complete result
+        self.on_data_fetched(chunk)
+
+    def on_stream_finished(self):
+        """Called after the last chunk of a streaming fetch."""
+
     def show_loading(self):
         """Display the loading indicator."""
         if self.data_provider:
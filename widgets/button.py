@@ -7,7 +7,6 @@ class Button(BaseWidget):
         super().__init__(data_provider=data_provider, results_handler=results_handler, *args, **kwargs)
         self.button = QPushButton(text)
         self.actions = actions or []
-        self.update_content()
 
         self.button.clicked.connect(self.on_click)
 
@@ -16,9 +15,6 @@ class Button(BaseWidget):
         for action in self.actions:
             print(f"Executing action: {action}")
 
-    def update_content(self):
+    def on_data_fetched(self, data):
         """Update the button text dynamically."""
-        data = self.fetch_data()
-        if data is not None:
-            data = self.handle_results(data)
-            self.button.setText(str(data))
+        self.button.setText(str(data))
@@ -0,0 +1,109 @@
+import importlib
+import inspect
+import threading
+import ast
+import sys
+
+
+def resolve_callable_from_string(provider_string):
+    """Parse and resolve a string into a callable and its arguments."""
+    if "(" in provider_string and provider_string.endswith(")"):
+        module_function, args_str = provider_string.split("(", 1)
+        module_name, function_name = module_function.rsplit(".", 1)
+        module = importlib.import_module(module_name)
+        function = getattr(module, function_name)
+        args_str = args_str.rstrip(")")
+        args = ast.literal_eval(f"({args_str},)") if args_str.strip() else tuple()
+        return function, args
+    else:
+        module_name, function_name = provider_string.rsplit(".", 1)
+        module = importlib.import_module(module_name)
+        function = getattr(module, function_name)
+        return function, tuple()
+
+
+class CompiledCallable:
+    """A provider or handler string resolved once and bound to its literal arguments."""
+
+    __slots__ = ("spec", "module_name", "function", "args", "is_coroutine", "key")
+
+    def __init__(self, spec, module_name, function, args):
+        self.spec = spec
+        self.module_name = module_name
+        self.function = function
+        self.args = args
+        self.is_coroutine = inspect.iscoroutinefunction(function)
+        # Canonical form shared by every spelling of the same call (quotes, spacing, ...)
+        name = getattr(function, "__qualname__", None) or repr(function)
+        self.key = f"{module_name}.{name}{args!r}"
+
+    def __call__(self, *leading):
+        """Call the function with any leading arguments followed by the bound ones."""
+        return self.function(*leading, *self.args)
+
+    def __repr__(self):
+        return f"CompiledCallable({self.spec!r})"
+
+
+# Shared by every widget; keyed by the normalized spec string
+_callable_cache = {}
+_cache_lock = threading.Lock()
+# Called after invalidation so caches built on compiled callables can be dropped too
+_invalidation_hooks = []
+
+
+def normalize_spec(spec):
+    """Normalize a provider/handler string so equivalent spellings share a cache entry."""
+    return spec.strip()
+
+
+def compile_callable(spec):
+    """
+    Resolve a provider or handler string, reusing a shared compiled entry.
+
+    Args:
+        spec (str | callable): "module.function(args)" string or a callable object.
+
+    Returns:
+        CompiledCallable: The bound callable.
+    """
+    if callable(spec):
+        return CompiledCallable(repr(spec), getattr(spec, "__module__", None), spec, tuple())
+
+    key = normalize_spec(spec)
+    compiled = _callable_cache.get(key)
+    if compiled is not None:
+        return compiled
+
+    function, args = resolve_callable_from_string(key)
+    module_name = key.split("(", 1)[0].rsplit(".", 1)[0]
+    compiled = CompiledCallable(key, module_name, function, args)
+    with _cache_lock:
+        # Another thread may have compiled the same spec meanwhile; keep the first
+        return _callable_cache.setdefault(key, compiled)
+
+
+def invalidate_callable_cache(module_name=None):
+    """Drop compiled entries for one module, or every entry when no module is given."""
+    with _cache_lock:
+        if module_name is None:
+            _callable_cache.clear()
+        else:
+            for key in [k for k, v in _callable_cache.items() if v.module_name == module_name]:
+                del _callable_cache[key]
+    for hook in _invalidation_hooks:
+        hook()
+
+
+def on_invalidate(hook):
+    """Register a zero-argument callable to run whenever compiled callables are invalidated."""
+    _invalidation_hooks.append(hook)
+    return hook
+
+
+def reload_module(module_name):
+    """Reload a provider/handler module and invalidate the callables compiled from it."""
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
+    module = importlib.reload(module)
+    invalidate_callable_cache(module_name)
+    return module
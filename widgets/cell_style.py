@@ -0,0 +1,172 @@
+import numpy as np
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QBrush, QColor
+from widgets.base_widget import BaseWidget
+
+# Longest operators first so ">=" is not read as ">"
+OPERATORS = (">=", "<=", "==", "!=", ">", "<")
+
+
+def to_float_array(values):
+    """Convert a column to float64, mapping values that are not numbers to NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        result = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                result[i] = float(value)
+            except (TypeError, ValueError):
+                result[i] = np.nan
+        return result
+
+
+def to_str_array(values):
+    """Convert a column to an array of display strings."""
+    return np.asarray([str(value) for value in values], dtype=object)
+
+
+def column_arrays(values):
+    """
+    Return (numbers, texts) for evaluating conditions over a column.
+
+    Numeric NumPy columns are compared as numbers only, so texts is None and
+    no per-value strings are built.
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+        return values.astype(np.float64, copy=False), None
+    return to_float_array(values), to_str_array(values)
+
+
+class Condition:
+    def __init__(self, value):
+        """
+        A cell condition ("<X", ">=X", "==X", ...) parsed once.
+
+        Ordered comparisons are numeric and never match values that are not
+        numbers; equality compares the text, or the number when both sides are
+        numeric. A value without an operator is an exact match.
+        """
+        self.operator = "=="
+        operand = value
+        if isinstance(value, str):
+            for operator in OPERATORS:
+                if value.startswith(operator):
+                    self.operator, operand = operator, value[len(operator):]
+                    break
+        self.text = str(operand)
+        try:
+            self.number = float(operand)
+        except (TypeError, ValueError):
+            self.number = None
+
+    @property
+    def numeric(self):
+        return self.operator in (">", "<", ">=", "<=")
+
+    def evaluate(self, numbers, texts):
+        """Return a boolean mask over a column (given as float and string arrays; texts may be None)."""
+        if self.numeric:
+            if self.number is None:
+                return np.zeros(len(numbers), dtype=bool)
+            with np.errstate(invalid="ignore"):
+                if self.operator == ">":
+                    return numbers > self.number
+                if self.operator == "<":
+                    return numbers < self.number
+                if self.operator == ">=":
+                    return numbers >= self.number
+                return numbers <= self.number
+
+        equal = texts == self.text if texts is not None else np.zeros(len(numbers), dtype=bool)
+        if self.number is not None:
+            equal |= numbers == self.number
+        return ~equal if self.operator == "!=" else equal
+
+
+class CompiledCellStyle:
+    def __init__(self, cell_style, columns):
+        """
+        Table `cell_style` rules compiled into per-column predicates.
+
+        Each column is evaluated at once over arrays, producing one small style
+        index per cell. Index 0 is the default style; each distinct combination
+        of matching conditions gets its own index, whose Qt role values (with
+        cached brushes) are built once.
+
+        Args:
+            cell_style (dict): The `cell_style` configuration ({"default": ..., "conditions": [...]}).
+            columns (dict): Mapping of data key to header label; conditions may name either.
+        """
+        cell_style = cell_style or {}
+        self.default_style = cell_style.get("default", {})
+        self._brushes = {}
+        self.styles = [self.roles_for([])]
+        self._style_by_mask = {0: 0}
+
+        self.rules = {}
+        self._conditions = []
+        for condition in cell_style.get("conditions", []):
+            column = condition.get("column")
+            for key, header in columns.items():
+                if column in (key, header):
+                    self.rules.setdefault(key, []).append(len(self._conditions))
+            self._conditions.append((Condition(condition.get("value")), condition))
+
+    def has_rules(self, key):
+        return key in self.rules
+
+    def brush(self, color):
+        """Return a cached brush for a color string."""
+        brush = self._brushes.get(color)
+        if brush is None:
+            brush = self._brushes[color] = QBrush(QColor(color))
+        return brush
+
+    def roles_for(self, condition_ids):
+        """Merge the default style and the given conditions (in order) into Qt role values."""
+        roles = {}
+        if "background-color" in self.default_style:
+            roles[Qt.BackgroundRole] = self.brush(self.default_style["background-color"])
+        if "color" in self.default_style:
+            roles[Qt.ForegroundRole] = self.brush(self.default_style["color"])
+        if "alignment" in self.default_style:
+            roles[Qt.TextAlignmentRole] = BaseWidget.parse_alignment(self.default_style["alignment"])
+        for condition_id in condition_ids:
+            condition = self._conditions[condition_id][1]
+            if "background-color" in condition:
+                roles[Qt.BackgroundRole] = self.brush(condition["background-color"])
+            if "color" in condition:
+                roles[Qt.ForegroundRole] = self.brush(condition["color"])
+        return roles
+
+    def evaluate(self, key, values):
+        """
+        Evaluate a column's rules over its values.
+
+        Returns:
+            numpy.ndarray: One style index (into `styles`) per value.
+        """
+        if key not in self.rules or len(values) == 0:
+            return np.zeros(len(values), dtype=np.uint16)
+
+        numbers, texts = column_arrays(values)
+        masks = np.zeros(len(values), dtype=np.uint64)
+        for bit, condition_id in enumerate(self.rules[key]):
+            matched = self._conditions[condition_id][0].evaluate(numbers, texts)
+            masks |= matched.astype(np.uint64) << np.uint64(bit)
+
+        unique_masks, inverse = np.unique(masks, return_inverse=True)
+        lookup = np.array([self.style_index(key, int(mask)) for mask in unique_masks], dtype=np.uint16)
+        return lookup[inverse]
+
+    def style_index(self, key, mask):
+        """Return the style index for a column's bitmask of matched conditions."""
+        cache_key = (key, mask) if mask else 0
+        index = self._style_by_mask.get(cache_key)
+        if index is None:
+            condition_ids = [c for bit, c in enumerate(self.rules[key]) if mask >> bit & 1]
+            index = len(self.styles)
+            self.styles.append(self.roles_for(condition_ids))
+            self._style_by_mask[cache_key] = index
+        return index
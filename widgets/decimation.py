@@ -0,0 +1,126 @@
+import math
+import numpy as np
+from widgets.ring_buffer import RingBuffer
+
+
+def bucket_size_for(window, pixels):
+    """Return how many samples share one pixel column (1 when no decimation is needed)."""
+    if pixels < 1:
+        return 1
+    size = math.ceil(window / pixels)
+    # Two points per bucket only pays off once a bucket holds more than two samples
+    return size if size > 2 else 1
+
+
+class MinMaxDecimator:
+    def __init__(self, window, bucket_size):
+        """
+        Per-pixel min/max decimation of a sliding window of samples.
+
+        Buckets are aligned to absolute sample numbers, so a new sample only
+        updates the newest bucket and whole buckets drop out at the old end;
+        nothing else is recomputed. Each bucket contributes its minimum and
+        maximum (in time order), so spikes survive decimation and the output
+        size depends on the bucket count, not the history length.
+
+        Args:
+            window (int): Number of samples in the displayed history.
+            bucket_size (int): Samples per bucket (typically samples per pixel).
+        """
+        self.window = window
+        self.bucket_size = max(1, int(bucket_size))
+        self.reset()
+
+    def reset(self):
+        """Forget every bucket."""
+        capacity = self.window // self.bucket_size + 2
+        # First and second point of every bucket, as absolute sample index and value
+        self.first_x = RingBuffer(capacity)
+        self.first_y = RingBuffer(capacity)
+        self.second_x = RingBuffer(capacity)
+        self.second_y = RingBuffer(capacity)
+        self.count = 0
+        self.bucket = None
+        self.low = self.high = None
+
+    def push(self, value):
+        """Add the next sample."""
+        index = self.count
+        self.count += 1
+        bucket = index // self.bucket_size
+        if bucket != self.bucket:
+            self.bucket = bucket
+            self.low = self.high = (index, value)
+            for ring, item in (
+                (self.first_x, index), (self.first_y, value),
+                (self.second_x, index), (self.second_y, value),
+            ):
+                ring.append(item)
+            return
+
+        if value < self.low[1]:
+            self.low = (index, value)
+        elif value > self.high[1]:
+            self.high = (index, value)
+        else:
+            return
+        first, second = sorted((self.low, self.high))
+        self.first_x.set_latest(first[0])
+        self.first_y.set_latest(first[1])
+        self.second_x.set_latest(second[0])
+        self.second_y.set_latest(second[1])
+
+    def rebuild(self, values, count):
+        """
+        Recompute every bucket from the stored history (after a resize).
+
+        Args:
+            values (numpy.ndarray): The history, oldest first.
+            count (int): Absolute number of the sample after the newest one.
+        """
+        self.reset()
+        start = count - len(values)
+        # Restart the sample numbering at the first complete bucket boundary before the history
+        self.count = start - start % self.bucket_size
+        lead = start - self.count
+        padded = np.concatenate((np.full(lead, np.nan), np.asarray(values, dtype=np.float64)))
+        tail = -len(padded) % self.bucket_size
+        padded = np.concatenate((padded, np.full(tail, np.nan)))
+        buckets = padded.reshape(-1, self.bucket_size)
+        filled = ~np.isnan(buckets).all(axis=1)
+
+        base = self.count + np.arange(len(buckets)) * self.bucket_size
+        safe = np.where(np.isnan(buckets), np.inf, buckets)
+        low_at = safe.argmin(axis=1)
+        high_at = np.where(np.isnan(buckets), -np.inf, buckets).argmax(axis=1)
+        first_at = np.minimum(low_at, high_at)
+        second_at = np.maximum(low_at, high_at)
+        rows = np.arange(len(buckets))
+        for i in rows[filled]:
+            self.first_x.append(base[i] + first_at[i])
+            self.first_y.append(buckets[i, first_at[i]])
+            self.second_x.append(base[i] + second_at[i])
+            self.second_y.append(buckets[i, second_at[i]])
+
+        self.count = count
+        if len(values):
+            self.bucket = (count - 1) // self.bucket_size
+            last = rows[filled][-1]
+            self.low = (base[last] + low_at[last], buckets[last, low_at[last]])
+            self.high = (base[last] + high_at[last], buckets[last, high_at[last]])
+
+    def points(self):
+        """
+        Return (x, y) arrays for the series; x is relative to the oldest sample
+        of the window, so it lines up with an axis of 0..window.
+        """
+        oldest = self.count - self.window
+        keep = self.second_x.view() >= oldest
+        x = np.empty(2 * int(keep.sum()), dtype=np.float64)
+        y = np.empty_like(x)
+        x[0::2] = self.first_x.view()[keep]
+        x[1::2] = self.second_x.view()[keep]
+        y[0::2] = self.first_y.view()[keep]
+        y[1::2] = self.second_y.view()[keep]
+        x -= oldest
+        return x, y
@@ -1,7 +1,6 @@
 from PySide6.QtWidgets import QLabel
 from PySide6.QtCore import Qt
 from widgets.base_widget import BaseWidget
-import asyncio
 
 
 class Label(BaseWidget):
@@ -36,12 +35,14 @@ class Label(BaseWidget):
         # Apply styles
         self.apply_styles()
 
-        # Initialize BaseWidget
-        super().__init__(self.label, *args, **kwargs)
-
-        # Fetch initial data if data_provider is defined
-        if data_provider:
-            asyncio.ensure_future(self.refresh_text())
+        # Initialize BaseWidget; it schedules the initial fetch (sync or coroutine providers)
+        super().__init__(
+            data_provider=data_provider,
+            results_handler=results_handler,
+            *args,
+            **kwargs,
+        )
+        self.add_child_widget(self.label)
 
     def apply_alignment(self, alignment):
         """Set the text alignment."""
@@ -61,11 +62,6 @@ class Label(BaseWidget):
             stylesheet += f"{key}: {value};"
         self.label.setStyleSheet(stylesheet)
 
-    async def refresh_text(self):
-        """Fetch dynamic text using the data_provider and update the label."""
-        text = await self.fetch_data()
-        if text is not None:
-            # Process the fetched data with the results_handler, if defined
-            if self.results_handler:
-                text = self.handle_results(text)
-            self.label.setText(text)
+    def on_data_fetched(self, data):
+        """Update the label with the fetched (and processed) text."""
+        self.label.setText(str(data))
@@ -1,11 +1,104 @@
+import math
+import time
+import numpy as np
 from PySide6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
 from PySide6.QtGui import QColor
-from PySide6.QtCore import Qt, QTimer
-from collections import deque
+from PySide6.QtWidgets import QGraphicsSimpleTextItem
+from PySide6.QtCore import QEvent, Qt
 from widgets.base_widget import BaseWidget
+from widgets.decimation import MinMaxDecimator, bucket_size_for
+from widgets.latency_stats import LatencyStats, register_latency_stats
+from widgets.latency_store import ROLLUPS, get_history_store
+from widgets.ring_buffer import RingBuffer
+from widgets.window_stats import SlidingWindowStats
+
+
+class LatencyTrace:
+    def __init__(self, name, max_x, irregular_factor, history=False):
+        """
+        The samples, statistics and series of one probed host.
+
+        Args:
+            name: Key the statistics are published under (and the history file is named after).
+            max_x: Number of samples shown in the live window.
+            irregular_factor: Samples above this multiple of the rolling mean count as irregular.
+            history: Persist samples to the target's memory-mapped history file.
+        """
+        self.name = name
+        self.max_x = max_x
+        # Latency history in a preallocated ring buffer; x positions never change
+        self.latency_data = RingBuffer(max_x, fill=0.0)
+        self.sample_count = len(self.latency_data)
+        # Per-pixel min/max decimation, enabled once the history outgrows the plot width
+        self.decimator = None
+        # Sliding min/max/mean over the same window, updated per sample
+        self.window_stats = SlidingWindowStats(max_x, fill=0.0)
+
+        # O(1) statistics per probe, published for other widgets under the target name
+        self.stats = LatencyStats(irregular_factor, window=max_x)
+        register_latency_stats(name, self.stats)
+        self.last_irregular = False
+
+        # Persistent history: restore the latest window, then append every probe
+        self.history = get_history_store(name) if history else None
+        if self.history is not None:
+            self.restore_history()
+
+        self.series = QLineSeries()
+        self.overlay = None
+
+    def restore_history(self):
+        """Load the latest window of samples from the history file (lost probes show as 0)."""
+        samples = np.nan_to_num(self.history.tail(self.max_x), nan=0.0)
+        for value in samples:
+            self.latency_data.append(value)
+            self.window_stats.push(value)
+        self.sample_count += len(samples)
+
+    def append(self, value):
+        """Add one latency sample."""
+        if self.history is not None:
+            self.history.append(time.time(), value)
+        self.last_irregular = self.stats.add(value)
+        self.latency_data.append(value)
+        self.sample_count += 1
+        self.window_stats.push(value)
+        if self.decimator is not None:
+            self.decimator.push(value)
+
+    def record_loss(self):
+        """Record a probe that returned no latency."""
+        self.stats.add_loss()
+        if self.history is not None:
+            self.history.append(time.time(), None)
+
+    def set_bucket_size(self, bucket_size):
+        """Switch decimation to `bucket_size` samples per pixel; return True if it changed."""
+        current = self.decimator.bucket_size if self.decimator is not None else 1
+        if bucket_size == current:
+            return False
+        if bucket_size == 1:
+            self.decimator = None
+        else:
+            self.decimator = MinMaxDecimator(self.max_x, bucket_size)
+            self.decimator.rebuild(self.latency_data.view(), self.sample_count)
+        return True
+
+    def stats_text(self):
+        stats = self.stats
+        return (
+            f"avg {stats.mean:.1f} ms  σ {stats.stddev:.1f}  jitter {stats.jitter:.1f}  "
+            f"loss {stats.loss_ratio:.1%}  irregular {stats.irregular}"
+        )
 
 
 class LatencyChartWidget(BaseWidget):
+    # Y-axis autoscaling: never below MIN_Y_MAX, HEADROOM above the window maximum,
+    # and only shrink once the data needs less than SHRINK_RATIO of the current range
+    MIN_Y_MAX = 200
+    HEADROOM = 1.2
+    SHRINK_RATIO = 0.5
+
     def __init__(
         self,
         target_host,
@@ -17,9 +110,36 @@ class LatencyChartWidget(BaseWidget):
         alignment="center",
         margins=None,
         style=None,
+        history=False,
+        show_stats=True,
+        targets=None,
         *args,
         **kwargs,
     ):
+        """
+        Create a latency chart.
+
+        Args:
+            target_host: Host shown in the title (and used to name its history file).
+            interval: Probe interval in milliseconds.
+            max_x: Number of samples shown in the live window.
+            irregular_factor: Samples above this multiple of the rolling mean count as irregular.
+            results_handler: A string specifying a function to process data (optional).
+            data_provider: A string specifying a function returning one latency sample
+                (or, with targets, a dict of latencies per host).
+            alignment: Alignment of the widget.
+            margins: Margins for the widget.
+            style: CSS-like styles for the widget.
+            history: Persist samples to a memory-mapped history file, restore them on start and
+                allow zooming out over the stored rollups with the mouse wheel.
+            show_stats: Draw the latency statistics (mean, jitter, loss, irregular samples) over the chart.
+            targets: Hosts to probe together, one series each (optional). Without a data_provider
+                they are pinged with `network.ping_many`, over one ICMP socket per tick.
+        """
+        self.targets = list(targets) if targets else None
+        if self.targets and not data_provider:
+            timeout = min(1.0, (interval or 1000) / 1000)
+            data_provider = f"network.ping_many({self.targets!r}, {timeout})"
         super().__init__(
             alignment=alignment,
             margins=margins,
@@ -37,57 +157,215 @@ class LatencyChartWidget(BaseWidget):
         self.irregular_factor = irregular_factor
         self.style = style or {}
 
-        # Initialize latency data storage
-        self.latency_data = deque([0] * max_x, maxlen=max_x)
+        self.x_values = np.arange(max_x, dtype=np.float64)
+        self.span = None
+
+        # One trace per probed host; a single-target chart keeps its target as the key
+        names = self.targets or [target_host or data_provider]
+        self.traces = {}
+        for name in names:
+            try:
+                self.traces[name] = LatencyTrace(name, max_x, irregular_factor, history=history)
+            except (OSError, ValueError) as e:
+                self.log(f"Latency history unavailable for {name}: {e}")
+                self.traces[name] = LatencyTrace(name, max_x, irregular_factor)
+        self.history = any(trace.history is not None for trace in self.traces.values())
 
         # Set up chart
         self.chart = QChart()
-        self.series = QLineSeries()
-        self.chart.addSeries(self.series)
-        self.chart.setTitle(f"Latency Monitoring to {self.target_host}")
+        for name, trace in self.traces.items():
+            self.chart.addSeries(trace.series)
+            if self.targets:
+                trace.series.setName(str(name))
+        if self.targets:
+            self.chart.setTitle(f"Latency Monitoring to {len(self.targets)} hosts")
+        else:
+            self.chart.setTitle(f"Latency Monitoring to {self.target_host}")
 
         # Configure axes
         self.axisX = QValueAxis()
         self.axisX.setTitleText("Time")
         self.axisX.setRange(0, max_x)
         self.chart.addAxis(self.axisX, Qt.AlignBottom)
-        self.series.attachAxis(self.axisX)
 
         self.axisY = QValueAxis()
         self.axisY.setTitleText("Latency (ms)")
-        self.axisY.setRange(0, 200)
+        self.y_max = self.MIN_Y_MAX
+        self.axisY.setRange(0, self.y_max)
         self.chart.addAxis(self.axisY, Qt.AlignLeft)
-        self.series.attachAxis(self.axisY)
+        for trace in self.traces.values():
+            trace.series.attachAxis(self.axisX)
+            trace.series.attachAxis(self.axisY)
 
         # Apply style settings
-        if "color" in self.style:
+        if "color" in self.style and not self.targets:
             self.series.setColor(QColor(self.style["color"]))
 
+        # Statistics overlay in the top-left corner of the plot area, one line per host
+        self.show_stats = show_stats
+        self.default_overlay_brush = None
+        if show_stats:
+            for trace in self.traces.values():
+                trace.overlay = QGraphicsSimpleTextItem(self.chart)
+                self.default_overlay_brush = trace.overlay.brush()
+
+        # Decimation follows the plot width
+        self.chart.plotAreaChanged.connect(self.on_plot_area_changed)
+
         # Chart View
         self.chart_view = QChartView(self.chart)
         self.add_child_widget(self.chart_view)
+        if self.history:
+            # The mouse wheel zooms out over the stored history
+            self.chart_view.viewport().installEventFilter(self)
 
-        # Timer for periodic updates
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.periodic_task)
-        self.timer.start(self.interval)
+    @property
+    def series(self):
+        """The series of the first (for single-target charts, the only) trace."""
+        return next(iter(self.traces.values())).series
 
     def on_data_fetched(self, data):
         """Callback for processing fetched data."""
-        if isinstance(data, (int, float)):  # Ensure data is numeric
-            self.latency_data.append(data)
+        self.append_sample(data)
+        self.update_chart()
+
+    def on_data_chunk(self, chunk):
+        """Append the sample(s) of one streamed chunk."""
+        for value in chunk if isinstance(chunk, list) else [chunk]:
+            self.append_sample(value)
+        self.update_chart()
+
+    def on_cached_result(self, data):
+        """A cached result is not a new probe: redraw without recording a sample."""
+        self.hide_loading()
+        self.update_chart()
+
+    def on_fetch_empty(self):
+        """A probe whose provider returned nothing counts as a lost sample."""
+        self.record_loss()
+
+    def on_worker_error(self, message):
+        super().on_worker_error(message)
+        self.record_loss()
+
+    def record_loss(self):
+        """Record a probe that returned no latency, for every host."""
+        for trace in self.traces.values():
+            trace.record_loss()
+        self.update_stats_overlay()
+
+    def append_sample(self, data):
+        """Add one latency sample, or with targets a dict of samples per host, to the history."""
+        if self.targets and isinstance(data, dict):
+            for name, trace in self.traces.items():
+                value = data.get(name)
+                if isinstance(value, (int, float)):
+                    trace.append(value)
+                else:
+                    trace.record_loss()
+        elif isinstance(data, (int, float)) and not self.targets:  # Ensure data is numeric
+            next(iter(self.traces.values())).append(data)
         else:
             self.log("Invalid data type received for latency chart.")
 
-        # Update series with new data
-        self.series.clear()
-        for i, value in enumerate(self.latency_data):
-            self.series.append(i, value)
+    def update_chart(self):
+        """Redraw the series from the latency history."""
+        self.update_stats_overlay()
+        if self.span is not None:
+            self.show_stored_history()
+            return
+        # One bulk call per series hands the whole window to Qt instead of a call per point
+        for trace in self.traces.values():
+            if trace.decimator is not None:
+                trace.series.replaceNp(*trace.decimator.points())
+            else:
+                values = trace.latency_data.view()
+                trace.series.replaceNp(self.x_values[:len(values)], values)
+
+        self.rescale_y_axis()
+
+    def live_span(self):
+        """Return the time covered by the live window, in seconds."""
+        return self.max_x * (self.interval or 1000) / 1000
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Wheel:
+            self.zoom(out=event.angleDelta().y() < 0)
+            return True
+        return super().eventFilter(watched, event)
+
+    def zoom(self, out):
+        """Double (or halve) the displayed time span; back at the live window, show live samples."""
+        span = (self.span or self.live_span()) * (2 if out else 0.5)
+        longest = ROLLUPS[-1][0] * ROLLUPS[-1][1]
+        if span <= self.live_span():
+            self.span = None
+            self.axisX.setTitleText("Time")
+            self.axisX.setRange(0, self.max_x)
+        else:
+            self.span = min(span, longest)
+            self.axisX.setTitleText("Time (s)")
+            self.axisX.setRange(-self.span, 0)
+        self.update_chart()
+
+    def show_stored_history(self):
+        """Draw the average latency of the displayed span from the history files' rollups."""
+        now = time.time()
+        points = max(int(self.chart.plotArea().width()), 100)
+        maximum = 0.0
+        for trace in self.traces.values():
+            if trace.history is None:
+                trace.series.clear()
+                continue
+            records = trace.history.query(now - self.span, now, max_points=points)
+            x = records["t"] - now
+            y = np.nan_to_num(records["avg"].astype(np.float64), nan=0.0)
+            trace.series.replaceNp(x, y)
+            if len(records):
+                maximum = max(maximum, float(np.nan_to_num(np.nanmax(records["max"]))))
+        self.rescale_y_axis(maximum)
+
+    def update_stats_overlay(self):
+        """Show the current statistics; a line turns red after an irregular sample of its host."""
+        if not self.show_stats:
+            return
+        for trace in self.traces.values():
+            prefix = f"{trace.name}: " if self.targets else ""
+            trace.overlay.setText(prefix + trace.stats_text())
+            trace.overlay.setBrush(QColor("red") if trace.last_irregular else self.default_overlay_brush)
+
+    def on_plot_area_changed(self, area):
+        """Re-bucket the history when the plot width changes."""
+        if self.show_stats:
+            top = area.top() + 4
+            for trace in self.traces.values():
+                trace.overlay.setPos(area.left() + 8, top)
+                top += trace.overlay.boundingRect().height()
+        bucket_size = bucket_size_for(self.max_x, int(area.width()))
+        changed = [trace.set_bucket_size(bucket_size) for trace in self.traces.values()]
+        if any(changed):
+            self.update_chart()
 
-        # Adjust Y-axis dynamically
-        max_latency = max(self.latency_data)
-        self.axisY.setRange(0, max(max_latency * 1.2, 200))
+    @staticmethod
+    def nice_ceiling(value):
+        """Round up to 1, 2 or 5 times a power of ten, so the axis moves in stable steps."""
+        if value <= 0:
+            return 0
+        magnitude = 10 ** math.floor(math.log10(value))
+        for step in (1, 2, 5, 10):
+            if value <= step * magnitude:
+                return step * magnitude
+        return 10 * magnitude
 
-    def periodic_task(self):
-        """Fetch new data and refresh the chart."""
-        self.defer_data_fetching()
+    def rescale_y_axis(self, maximum=None):
+        """
+        Resize the Y axis only when needed: grow as soon as the window maximum
+        (or the given one) no longer fits, shrink only once it uses less than
+        SHRINK_RATIO of it.
+        """
+        if maximum is None:
+            maximum = max(trace.window_stats.maximum or 0 for trace in self.traces.values())
+        needed = max(maximum * self.HEADROOM, self.MIN_Y_MAX)
+        if needed > self.y_max or needed < self.y_max * self.SHRINK_RATIO:
+            self.y_max = max(self.nice_ceiling(needed), self.MIN_Y_MAX)
+            self.axisY.setRange(0, self.y_max)
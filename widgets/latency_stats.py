@@ -0,0 +1,121 @@
+import math
+import threading
+from widgets.window_stats import SlidingWindowStats
+
+
+class LatencyStats:
+    def __init__(self, irregular_factor=3, window=180):
+        """
+        Latency statistics updated in O(1) per probe.
+
+        - mean and variance with Welford's algorithm,
+        - jitter as in RFC 3550 (J += (|D| - J) / 16, D being the difference
+          between consecutive latencies),
+        - loss ratio over every probe,
+        - irregular samples: latencies above `irregular_factor` times the
+          rolling mean of the previous `window` samples.
+
+        Args:
+            irregular_factor (float): Multiple of the rolling mean above which a sample is irregular.
+            window (int): Number of samples in the rolling mean.
+        """
+        self.irregular_factor = irregular_factor
+        self.rolling = SlidingWindowStats(window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.jitter = 0.0
+        self.last = None
+        self.lost = 0
+        self.irregular = 0
+        self.last_irregular = None
+
+    def add(self, latency):
+        """
+        Add one latency sample.
+
+        Returns:
+            bool: True if the sample is irregular.
+        """
+        latency = float(latency)
+        with self._lock:
+            rolling_mean = self.rolling.mean
+            irregular = (
+                rolling_mean is not None
+                and rolling_mean > 0
+                and latency > self.irregular_factor * rolling_mean
+            )
+            if irregular:
+                self.irregular += 1
+                self.last_irregular = latency
+            self.rolling.push(latency)
+
+            self.count += 1
+            delta = latency - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (latency - self.mean)
+
+            if self.last is not None:
+                self.jitter += (abs(latency - self.last) - self.jitter) / 16
+            self.last = latency
+            return irregular
+
+    def add_loss(self):
+        """Count a probe that returned no latency."""
+        with self._lock:
+            self.lost += 1
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def loss_ratio(self):
+        probes = self.count + self.lost
+        return self.lost / probes if probes else 0.0
+
+    def snapshot(self):
+        """Return the current statistics as a dict."""
+        with self._lock:
+            return {
+                "samples": self.count,
+                "mean": self.mean,
+                "stddev": self.stddev,
+                "jitter": self.jitter,
+                "rolling_mean": self.rolling.mean,
+                "lost": self.lost,
+                "loss_ratio": self.loss_ratio,
+                "irregular": self.irregular,
+                "last_irregular": self.last_irregular,
+            }
+
+
+_latency_stats = {}
+_stats_lock = threading.Lock()
+
+
+def register_latency_stats(target, stats):
+    """Publish a chart's statistics under its target so other widgets can query them."""
+    with _stats_lock:
+        _latency_stats[target] = stats
+
+
+def get_latency_stats(target):
+    """Return the statistics published for `target` (None if no chart probes it)."""
+    with _stats_lock:
+        return _latency_stats.get(target)
+
+
+def latency_summary(target):
+    """
+    Data provider returning the latency statistics of a charted target, so
+    other widgets can display them, e.g.
+    `data_provider: "widgets.latency_stats.latency_summary('google.com')"`.
+    """
+    stats = get_latency_stats(target)
+    return stats.snapshot() if stats is not None else None
@@ -0,0 +1,251 @@
+import math
+import os
+import re
+import threading
+import numpy as np
+
+MAGIC = b"BWLAT001"
+HEADER_SIZE = 128
+# Rollup resolutions in seconds and how many buckets of each are kept (1 day, 30 days, 1 year)
+ROLLUPS = ((1, 86400), (60, 43200), (3600, 8760))
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("raw_capacity", "<u8"),
+    ("rollup_capacity", "<u8", (len(ROLLUPS),)),
+    ("raw_written", "<u8"),
+    ("rollup_written", "<u8", (len(ROLLUPS),)),
+])
+# A lost probe is stored with a NaN latency
+RAW_DTYPE = np.dtype([("t", "<f8"), ("latency", "<f4")])
+ROLLUP_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("min", "<f4"),
+    ("max", "<f4"),
+    ("sum", "<f8"),
+    ("count", "<u4"),
+    ("lost", "<u4"),
+])
+# Fields returned by LatencyStore.query()
+QUERY_DTYPE = np.dtype([("t", "<f8"), ("min", "<f4"), ("max", "<f4"), ("avg", "<f4"), ("loss", "<f4")])
+
+
+class Ring:
+    """A fixed-size ring of records inside the memory map; `written` counts every record ever added."""
+
+    def __init__(self, records, written):
+        self.records = records
+        self.capacity = len(records)
+        self.written = int(written)
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def position(self, index):
+        """Map a chronological index (0 = oldest kept record) to a ring position."""
+        return (self.written - len(self) + index) % self.capacity
+
+    def append(self, record):
+        self.records[self.written % self.capacity] = record
+        self.written += 1
+
+    def set_latest(self, record):
+        self.records[(self.written - 1) % self.capacity] = record
+
+    def latest(self):
+        return self.records[(self.written - 1) % self.capacity] if self.written else None
+
+    def slice(self, start, stop):
+        """Return chronological records [start, stop) as an array (at most two copies)."""
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return self.records[:0].copy()
+        first, last = self.position(start), self.position(stop - 1)
+        if first <= last:
+            return self.records[first:last + 1].copy()
+        return np.concatenate((self.records[first:], self.records[:last + 1]))
+
+    def find(self, t):
+        """Return the chronological index of the first record with a time >= t (binary search)."""
+        times = self.records["t"]
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if times[self.position(middle)] < t:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+class LatencyStore:
+    def __init__(self, path, raw_capacity=86400):
+        """
+        On-disk latency history for one target, in a memory-mapped file.
+
+        The file holds a ring of raw samples plus rings of 1 s, 1 min and 1 h
+        rollups (min, max, average and loss). Appending writes one raw record
+        and updates the current bucket of each rollup in place, so the cost is
+        constant. Opening the file maps it without reading it; queries read
+        only the records they return.
+
+        Args:
+            path (str): File to use; it is created (or re-created if its layout changed).
+            raw_capacity (int): Number of raw samples kept.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        capacities = [capacity for _, capacity in ROLLUPS]
+        sizes = [raw_capacity * RAW_DTYPE.itemsize] + [c * ROLLUP_DTYPE.itemsize for c in capacities]
+        total = HEADER_SIZE + sum(sizes)
+
+        reuse = False
+        if os.path.exists(path) and os.path.getsize(path) == total:
+            header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)[0]
+            reuse = (
+                header["magic"] == MAGIC
+                and header["raw_capacity"] == raw_capacity
+                and list(header["rollup_capacity"]) == capacities
+            )
+        if not reuse:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._map = np.memmap(path, dtype=np.uint8, mode="r+" if reuse else "w+", shape=(total,))
+
+        self.header = self._map[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)
+        if not reuse:
+            self.header[0] = (MAGIC, raw_capacity, capacities, 0, [0] * len(ROLLUPS))
+
+        offset = HEADER_SIZE
+        regions = []
+        for size, dtype in zip(sizes, [RAW_DTYPE] + [ROLLUP_DTYPE] * len(ROLLUPS)):
+            regions.append(self._map[offset:offset + size].view(dtype))
+            offset += size
+        self.raw = Ring(regions[0], self.header["raw_written"][0])
+        self.rollups = [
+            Ring(records, written) for records, written in zip(regions[1:], self.header["rollup_written"][0])
+        ]
+
+    def append(self, t, latency):
+        """
+        Record one probe.
+
+        Args:
+            t (float): Unix time of the probe.
+            latency (float): Latency in ms, or None for a lost probe.
+        """
+        lost = latency is None or (isinstance(latency, float) and math.isnan(latency))
+        value = math.nan if lost else float(latency)
+        with self._lock:
+            self.raw.append((t, value))
+            for (resolution, _), ring in zip(ROLLUPS, self.rollups):
+                bucket = math.floor(t / resolution) * resolution
+                latest = ring.latest()
+                if latest is not None and latest["t"] == bucket:
+                    count, missing = int(latest["count"]), int(latest["lost"])
+                    if lost:
+                        record = (bucket, latest["min"], latest["max"], latest["sum"], count, missing + 1)
+                    elif count:
+                        record = (
+                            bucket, min(latest["min"], value), max(latest["max"], value),
+                            latest["sum"] + value, count + 1, missing,
+                        )
+                    else:
+                        record = (bucket, value, value, value, 1, missing)
+                    ring.set_latest(record)
+                elif lost:
+                    ring.append((bucket, math.nan, math.nan, 0.0, 0, 1))
+                else:
+                    ring.append((bucket, value, value, value, 1, 0))
+            self.header["raw_written"] = self.raw.written
+            self.header["rollup_written"] = [ring.written for ring in self.rollups]
+
+    def tail(self, count):
+        """Return the latest `count` raw latencies, oldest first (NaN for lost probes)."""
+        with self._lock:
+            return self.raw.slice(len(self.raw) - count, len(self.raw))["latency"].astype(np.float64)
+
+    def query(self, start, end, max_points=1000):
+        """
+        Return the history between two Unix times at the finest resolution that
+        fits in `max_points` records and still reaches back to `start`.
+
+        Returns:
+            numpy.ndarray: Records with fields t, min, max, avg and loss (0..1), oldest first.
+        """
+        span = max(end - start, 0)
+        with self._lock:
+            # Finest rollup within max_points; if none reaches back to `start`,
+            # the one holding the oldest data
+            fitting = [
+                (resolution, ring) for (resolution, _), ring in zip(ROLLUPS, self.rollups)
+                if span / resolution <= max_points
+            ] or [(ROLLUPS[-1][0], self.rollups[-1])]
+            # When each ring's oldest bucket ends
+            oldest = [
+                ring.records["t"][ring.position(0)] + resolution if len(ring) else math.inf
+                for resolution, ring in fitting
+            ]
+            covering = [i for i, t in enumerate(oldest) if t <= start]
+
+            # Raw samples win when they fit and reach back as far as the rollups do
+            raw = self.raw
+            if len(raw) and (covering == [] or raw.records["t"][raw.position(0)] <= start):
+                first, last = raw.find(start), raw.find(end + 1e-9)
+                if last - first <= max_points:
+                    records = raw.slice(first, last)
+                    result = np.zeros(len(records), dtype=QUERY_DTYPE)
+                    result["t"] = records["t"]
+                    for field in ("min", "max", "avg"):
+                        result[field] = records["latency"]
+                    result["loss"] = np.isnan(records["latency"])
+                    return result
+
+            resolution, ring = fitting[covering[0] if covering else int(np.argmin(oldest))]
+            records = ring.slice(ring.find(start - resolution), ring.find(end + 1e-9))
+
+        result = np.zeros(len(records), dtype=QUERY_DTYPE)
+        result["t"] = records["t"]
+        result["min"] = records["min"]
+        result["max"] = records["max"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result["avg"] = records["sum"] / records["count"]
+            result["loss"] = records["lost"] / (records["count"] + records["lost"])
+        return result
+
+    def flush(self):
+        """Write dirty pages to disk."""
+        with self._lock:
+            self._map.flush()
+
+
+_history_dir = os.path.join(os.path.expanduser("~"), ".bwidgets", "history")
+_raw_capacity = 86400
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def configure_history(directory=None, raw_capacity=None):
+    """Set where latency histories are stored and how many raw samples each keeps."""
+    global _history_dir, _raw_capacity
+    if directory:
+        _history_dir = os.path.expanduser(directory)
+    if raw_capacity:
+        _raw_capacity = int(raw_capacity)
+
+
+def get_history_store(target):
+    """Return the shared latency store of a target, opening its file on first use."""
+    with _stores_lock:
+        store = _stores.get(target)
+        if store is None:
+            name = re.sub(r"[^A-Za-z0-9._-]", "_", str(target))
+            path = os.path.join(_history_dir, f"latency-{name}.bin")
+            store = _stores[target] = LatencyStore(path, raw_capacity=_raw_capacity)
+        return store
+
+
+def shutdown_history():
+    """Flush every open latency store."""
+    with _stores_lock:
+        for store in _stores.values():
+            store.flush()
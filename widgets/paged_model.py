@@ -0,0 +1,204 @@
+import time
+from collections import OrderedDict
+from functools import partial
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from widgets.table_model import STYLE_ROLES
+
+PLACEHOLDER = "…"
+# A failed page is retried after RETRY_DELAY ms, doubling per failure up to RETRY_MAX_DELAY
+RETRY_DELAY = 1000
+RETRY_MAX_DELAY = 60000
+
+
+class PagedTableModel(QAbstractTableModel):
+    def __init__(self, columns, request_page, page_size=100, max_pages=20, cell_style=None, parent=None):
+        """
+        Table model whose rows are fetched page by page as the view needs them.
+
+        Pages are requested when a cell of a page that is not loaded is painted
+        (or, while the total is unknown, when the view scrolls to the end).
+        At most `max_pages` pages are kept; the least recently painted page is
+        dropped first and simply fetched again if it scrolls back into view.
+        A page that failed is not requested again until its retry delay has
+        passed; the delay doubles with each consecutive failure.
+
+        Args:
+            columns (dict): Mapping of data key to header label.
+            request_page (callable): Called as request_page(page, generation) to start fetching a page;
+                the result must come back through set_page() or fail_page().
+            page_size (int): Rows per page.
+            max_pages (int): Number of pages kept in the cache.
+            cell_style (CompiledCellStyle): Compiled conditional styles (optional).
+            parent (QObject): Optional Qt parent.
+        """
+        super().__init__(parent)
+        self.keys = list(columns.keys())
+        self.headers = list(columns.values())
+        self.request_page = request_page
+        self.page_size = max(1, int(page_size))
+        self.max_pages = max(1, int(max_pages))
+        self.cell_style = cell_style
+        # Page number -> (column key -> values, column key -> style indices), in LRU order
+        self.pages = OrderedDict()
+        # Cached pages from before the last refresh(); shown until their new version arrives
+        self.stale = set()
+        self.pending = set()
+        # Page number -> (consecutive failures, monotonic time of the next allowed request)
+        self.failed = {}
+        # Bumped by refresh() so results of older requests are ignored
+        self.generation = 0
+        self.total = None
+        self.loaded_rows = 0
+        self.exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.total if self.total is not None else self.loaded_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.keys)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        page, offset = divmod(index.row(), self.page_size)
+        entry = self.pages.get(page)
+        if entry is None or page in self.stale:
+            self.request(page)
+        if entry is None:
+            return PLACEHOLDER if role == Qt.DisplayRole else None
+        self.pages.move_to_end(page)
+
+        values, styles = entry
+        key = self.keys[index.column()]
+        if offset >= len(values[key]):
+            return None
+        if role == Qt.DisplayRole:
+            return str(values[key][offset])
+        if self.cell_style is not None and role in STYLE_ROLES:
+            style = styles[key][offset] if key in styles else 0
+            return self.cell_style.styles[style].get(role)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.total is None and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not parent.isValid():
+            self.request(self.loaded_rows // self.page_size)
+
+    def request(self, page):
+        """Ask for a page unless it is already on its way or waiting to be retried."""
+        if page in self.pending:
+            return
+        if page in self.failed and time.monotonic() < self.failed[page][1]:
+            return
+        self.pending.add(page)
+        self.request_page(page, self.generation)
+
+    def refresh(self):
+        """
+        Mark every cached page stale; the pages still in view keep their values
+        and are fetched again as they repaint. The row count is kept until new
+        results report otherwise.
+        """
+        self.generation += 1
+        self.stale = set(self.pages)
+        self.pending.clear()
+        self.exhausted = False
+        if self.rowCount() == 0:
+            self.request(0)
+            return
+        self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, len(self.keys) - 1))
+
+    def set_page(self, page, rows, total=None, generation=None):
+        """
+        Store a fetched page.
+
+        Args:
+            page (int): Page number.
+            rows (list): Row dicts of the page (fewer than page_size on the last page).
+            total (int): Total number of rows, if the provider reports it.
+            generation (int): Generation the page was requested for; stale pages are ignored.
+        """
+        if generation is not None and generation != self.generation:
+            return
+        self.pending.discard(page)
+        self.stale.discard(page)
+        self.failed.pop(page, None)
+        start = page * self.page_size
+
+        values = {key: [row.get(key, "") for row in rows] for key in self.keys}
+        styles = {}
+        if self.cell_style is not None:
+            styles = {
+                key: self.cell_style.evaluate(key, values[key])
+                for key in self.keys
+                if self.cell_style.has_rules(key)
+            }
+        self.pages[page] = (values, styles)
+        self.pages.move_to_end(page)
+        while len(self.pages) > self.max_pages:
+            self.stale.discard(self.pages.popitem(last=False)[0])
+
+        if total is not None:
+            self.resize(int(total))
+        else:
+            if len(rows) < self.page_size:
+                self.exhausted = True
+            end = start + len(rows)
+            if end > self.loaded_rows:
+                changed_end = self.loaded_rows
+                self.beginInsertRows(QModelIndex(), self.loaded_rows, end - 1)
+                self.loaded_rows = end
+                self.endInsertRows()
+                end = changed_end
+            if end > start:
+                self.dataChanged.emit(self.index(start, 0), self.index(end - 1, len(self.keys) - 1))
+            return
+
+        end = min(start + self.page_size, self.rowCount())
+        if end > start:
+            self.dataChanged.emit(self.index(start, 0), self.index(end - 1, len(self.keys) - 1))
+
+    def fail_page(self, page, generation=None):
+        """Forget a page request that failed and retry it once its backoff delay has passed."""
+        if generation is not None and generation != self.generation:
+            return
+        self.pending.discard(page)
+        failures = self.failed.get(page, (0, 0))[0] + 1
+        delay = min(RETRY_DELAY * 2 ** (failures - 1), RETRY_MAX_DELAY)
+        self.failed[page] = (failures, time.monotonic() + delay / 1000)
+        # Repaint the page when the delay is over; rows still in view request it again
+        QTimer.singleShot(delay, self, partial(self.repaint_page, page))
+
+    def repaint_page(self, page):
+        """Emit dataChanged for the rows of a page that is missing or stale."""
+        start = page * self.page_size
+        end = min(start + self.page_size, self.rowCount())
+        if (page not in self.pages or page in self.stale) and end > start:
+            self.dataChanged.emit(self.index(start, 0), self.index(end - 1, len(self.keys) - 1))
+
+    def resize(self, total):
+        """Grow or shrink the row count to a total reported by the provider."""
+        current = self.rowCount()
+        if total > current:
+            self.beginInsertRows(QModelIndex(), current, total - 1)
+            self.total = total
+            self.endInsertRows()
+        elif total < current:
+            self.beginRemoveRows(QModelIndex(), total, current - 1)
+            self.total = total
+            self.endRemoveRows()
+        else:
+            self.total = total
+
+    def cached_pages(self):
+        """Return the page numbers currently held in the cache, least recently used first."""
+        return list(self.pages)
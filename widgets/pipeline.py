@@ -0,0 +1,148 @@
+import threading
+import time
+from widgets.callables import compile_callable, normalize_spec, on_invalidate
+
+
+def map_stage(function):
+    """Mark a handler stage that transforms one item (or a scalar result) at a time."""
+    function.stage_kind = "map"
+    return function
+
+
+def filter_stage(function):
+    """Mark a handler stage that keeps an item when it returns a truthy value."""
+    function.stage_kind = "filter"
+    return function
+
+
+class FusedStage:
+    def __init__(self, stages):
+        """
+        Run consecutive map/filter stages in a single pass over the data.
+
+        Args:
+            stages (list): CompiledCallables whose functions are map or filter stages.
+        """
+        self.stages = [(stage.function.stage_kind == "filter", stage) for stage in stages]
+        self.name = " + ".join(stage.spec for stage in stages)
+
+    def apply_one(self, item):
+        """Run one item through every stage; returns (keep, item)."""
+        for is_filter, stage in self.stages:
+            if is_filter:
+                if not stage(item):
+                    return False, None
+            else:
+                item = stage(item)
+        return True, item
+
+    def __call__(self, data):
+        if not isinstance(data, list):
+            keep, value = self.apply_one(data)
+            return value if keep else None
+        result = []
+        append = result.append
+        apply_one = self.apply_one
+        for item in data:
+            keep, value = apply_one(item)
+            if keep:
+                append(value)
+        return result
+
+
+class Pipeline:
+    def __init__(self, specs):
+        """
+        A results handler made of several stages, compiled once.
+
+        Consecutive stages marked with @map_stage / @filter_stage are fused so
+        the data is walked once for all of them; other stages receive the whole
+        result. Time spent in each compiled stage is accumulated in `stats()`.
+
+        Args:
+            specs (list): Handler strings, applied in order.
+        """
+        self.specs = [normalize_spec(spec) for spec in specs]
+        self.stages = []
+        pending = []
+        for spec in self.specs:
+            compiled = compile_callable(spec)
+            if getattr(compiled.function, "stage_kind", None):
+                pending.append(compiled)
+                continue
+            if pending:
+                self.stages.append(FusedStage(pending))
+                pending = []
+            self.stages.append(compiled)
+        if pending:
+            self.stages.append(FusedStage(pending))
+
+        self._lock = threading.Lock()
+        self._timings = {self.stage_name(stage): [0, 0.0] for stage in self.stages}
+
+    @staticmethod
+    def stage_name(stage):
+        return stage.name if isinstance(stage, FusedStage) else stage.spec
+
+    def __call__(self, data):
+        for stage in self.stages:
+            if data is None:
+                break
+            started = time.perf_counter()
+            data = stage(data)
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                timing = self._timings[self.stage_name(stage)]
+                timing[0] += 1
+                timing[1] += elapsed
+        return data
+
+    def stats(self):
+        """Return {stage: {"calls": n, "total_ms": t, "avg_ms": t / n}} for every compiled stage."""
+        with self._lock:
+            return {
+                name: {
+                    "calls": calls,
+                    "total_ms": total * 1000,
+                    "avg_ms": total * 1000 / calls if calls else 0.0,
+                }
+                for name, (calls, total) in self._timings.items()
+            }
+
+    def __repr__(self):
+        return f"Pipeline({self.specs!r})"
+
+
+_pipeline_cache = {}
+_pipeline_lock = threading.Lock()
+
+
+def compile_handler(spec):
+    """
+    Compile a results handler: a single handler string/callable or a list of stages.
+
+    Pipelines are cached and shared by every widget using the same stage list.
+    """
+    if not isinstance(spec, (list, tuple)):
+        return compile_callable(spec)
+
+    key = tuple(normalize_spec(stage) for stage in spec)
+    pipeline = _pipeline_cache.get(key)
+    if pipeline is None:
+        pipeline = Pipeline(key)
+        with _pipeline_lock:
+            pipeline = _pipeline_cache.setdefault(key, pipeline)
+    return pipeline
+
+
+def handler_modules(spec):
+    """Return the module names referenced by a handler string or stage list."""
+    specs = spec if isinstance(spec, (list, tuple)) else [spec]
+    return [s.split("(", 1)[0].rsplit(".", 1)[0] for s in specs if isinstance(s, str)]
+
+
+@on_invalidate
+def invalidate_pipeline_cache():
+    """Drop every compiled pipeline (e.g. after a handler module was reloaded)."""
+    with _pipeline_lock:
+        _pipeline_cache.clear()
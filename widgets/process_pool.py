@@ -0,0 +1,112 @@
+import importlib
+import inspect
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from widgets.callables import compile_callable
+from widgets.pipeline import compile_handler
+
+
+def warm_up(module_names):
+    """Pre-import provider and handler modules in a pool process."""
+    for module_name in module_names:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            print(f"[ProcessPool] Could not pre-import {module_name}: {e}")
+
+
+def run_provider(provider_spec, handler_spec=None):
+    """
+    Run a provider and its results handler inside a pool process.
+
+    Both are given as strings and compiled in the child (and cached there),
+    so only the handler's compact result is pickled back to the GUI process.
+
+    Returns:
+        tuple: (result, empty); empty is True when the provider itself returned nothing.
+    """
+    data = compile_callable(provider_spec)()
+    if inspect.isawaitable(data):
+        data = asyncio.run(data)
+    elif inspect.isasyncgen(data):
+        data = asyncio.run(_collect(data))
+    # Generators can't cross the process boundary; send the whole result back
+    if inspect.isgenerator(data):
+        data = list(data)
+    if data is None:
+        return None, True
+    if handler_spec:
+        data = compile_handler(handler_spec)(data)
+    return data, False
+
+
+async def _collect(async_iterator):
+    return [chunk async for chunk in async_iterator]
+
+
+class ProcessPool:
+    def __init__(self, max_workers=None):
+        """
+        Warm process pool for CPU-bound or GIL-holding providers.
+
+        Processes are spawned (not forked, which is unsafe with Qt's threads)
+        and pre-import every module registered before the pool starts.
+
+        Args:
+            max_workers (int): Number of worker processes (defaults to the CPU count).
+        """
+        self.max_workers = max_workers
+        self.modules = set()
+        self._executor = None
+
+    def register_modules(self, module_names):
+        """Register modules to pre-import in every worker process."""
+        self.modules.update(name for name in module_names if name)
+
+    def start(self):
+        """Start the worker processes if they are not running yet."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_up,
+                initargs=(sorted(self.modules),),
+            )
+            # Spawn every worker now rather than on the first fetches
+            for _ in range(self.max_workers or os.cpu_count() or 1):
+                self._executor.submit(int)
+        return self._executor
+
+    def submit(self, provider_spec, handler_spec=None):
+        """Run a provider (and handler) in the pool; returns a concurrent future."""
+        return self.start().submit(run_provider, provider_spec, handler_spec)
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_process_pool = None
+
+
+def get_process_pool():
+    """Return the application-wide process pool."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPool()
+    return _process_pool
+
+
+def configure_process_pool(max_workers=None):
+    """Set the number of worker processes; call before widgets are created."""
+    get_process_pool().max_workers = max_workers
+
+
+def shutdown_process_pool():
+    """Stop the process pool if it was started."""
+    if _process_pool is not None:
+        _process_pool.shutdown()
@@ -0,0 +1,223 @@
+import inspect
+import threading
+from functools import partial
+from widgets.async_bridge import get_async_bridge
+from widgets.callables import compile_callable
+from widgets.process_pool import get_process_pool
+from widgets.result_cache import MISSING, get_result_cache
+from widgets.worker import FetchWorker
+
+
+class ProviderBus:
+    def __init__(self):
+        """
+        Coalesce fetches of identical data providers across widgets.
+
+        Fetches are keyed by the normalized provider call. While a fetch for a
+        key is in flight, every other widget requesting the same key joins it
+        instead of starting its own; when the provider returns, the raw data is
+        fanned out to each waiting widget, which applies its own results handler.
+
+        Generator and async-generator providers are streamed: each yielded chunk
+        goes through every waiting widget's handler and is emitted as it arrives;
+        widgets joining a running stream first get the chunks they missed,
+        handled on the thread pool, before the stream resumes emitting to them.
+
+        Widgets with a `cache_ttl` are served from the shared result cache: a
+        fresh entry skips the fetch entirely, a stale one is shown immediately
+        while a single refresh runs in the background. The cache holds handled
+        results, per provider call and results handler, so a hit runs no
+        handler on the GUI thread.
+        """
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._streams = {}
+        # Key -> {widget: stream ended} for widgets still replaying missed chunks
+        self._replaying = {}
+
+    def request(self, widget):
+        """
+        Request fresh data for a widget.
+
+        Returns:
+            bool: True if the widget will receive a fetch result, False if it was
+            served entirely from the result cache.
+        """
+        key = widget.provider_key
+        if widget.cache_ttl:
+            value, fresh = get_result_cache().lookup(self.cache_key(widget), widget.cache_ttl)
+            if value is not MISSING:
+                # Posted now, so it is always handled before the refresh result
+                widget.cached_ready.emit(value)
+                if fresh:
+                    return False
+
+        with self._lock:
+            waiting = self._in_flight.get(key)
+            if waiting is not None:
+                if widget not in waiting:
+                    waiting.append(widget)
+                    chunks = self._streams.get(key)
+                    if chunks:
+                        # The stream skips the widget until it has caught up
+                        self._replaying.setdefault(key, {})[widget] = False
+                        widget.thread_pool.start(FetchWorker(partial(self._replay, key, widget, chunks)))
+                return True
+            self._in_flight[key] = [widget]
+
+        if widget.executor == "process":
+            future = get_process_pool().submit(widget.data_provider, widget.results_handler)
+            future.add_done_callback(partial(self._on_process_done, key, widget))
+            return True
+
+        try:
+            provider = compile_callable(widget.data_provider)
+            if provider.is_coroutine:
+                # Awaited on the asyncio bridge; no pool thread is held while it runs
+                get_async_bridge().submit(provider(), partial(self._on_awaited, key, widget))
+                return True
+        except Exception as e:
+            widget.log(f"Error fetching data: {e}")
+            self._deliver(key, None)
+            return True
+
+        widget.thread_pool.start(FetchWorker(partial(self._run, key, widget)))
+        return True
+
+    @staticmethod
+    def cache_key(widget):
+        """Return the key of a widget's handled results: its provider call plus its results handler."""
+        if widget.executor == "process" or not widget.results_handler:
+            # Process keys already include the handler
+            return widget.provider_key
+        return f"{widget.provider_key}|{widget.results_handler!r}"
+
+    def is_in_flight(self, key):
+        """Return True if a fetch for the key is currently running."""
+        with self._lock:
+            return key in self._in_flight
+
+    def _run(self, key, leader):
+        """Run the provider once and deliver the result to every waiting widget (pool thread)."""
+        data = None
+        streamed = False
+        try:
+            data = leader.fetch_data()
+            if inspect.isasyncgen(data):
+                data = get_async_bridge().iterate(data)
+            if inspect.isgenerator(data):
+                self._stream(key, data)
+                data = None
+                streamed = True
+        finally:
+            self._deliver(key, data, empty=data is None and not streamed)
+
+    def _stream(self, key, chunks):
+        """Fan each chunk of a generator provider out to the waiting widgets (pool thread)."""
+        with self._lock:
+            self._streams[key] = []
+        try:
+            for chunk in chunks:
+                with self._lock:
+                    self._streams[key].append(chunk)
+                    replaying = self._replaying.get(key, {})
+                    waiting = [widget for widget in self._in_flight.get(key, ()) if widget not in replaying]
+                for widget in waiting:
+                    result = widget.handle_results(chunk)
+                    try:
+                        widget.chunk_ready.emit(result)
+                    except RuntimeError:
+                        pass
+        except Exception as e:
+            print(f"[ProviderBus] Error streaming {key}: {e}")
+        finally:
+            with self._lock:
+                self._streams.pop(key, None)
+
+    def _replay(self, key, widget, chunks):
+        """Emit the chunks a widget joining a running stream missed, until it has caught up (pool thread)."""
+        sent = 0
+        try:
+            while True:
+                with self._lock:
+                    missed = chunks[sent:]
+                    if not missed:
+                        replaying = self._replaying[key]
+                        ended = replaying.pop(widget)
+                        if not replaying:
+                            del self._replaying[key]
+                        break
+                for chunk in missed:
+                    widget.chunk_ready.emit(widget.handle_results(chunk))
+                sent += len(missed)
+            if ended:
+                # The stream finished while replaying; its end is delivered here, after the chunks
+                widget.data_ready.emit(None)
+        except RuntimeError:
+            # The widget was destroyed while replaying
+            with self._lock:
+                replaying = self._replaying.get(key, {})
+                replaying.pop(widget, None)
+                if not replaying:
+                    self._replaying.pop(key, None)
+
+    def _on_awaited(self, key, leader, future):
+        """Hand a finished coroutine result to the pool for fan-out (bridge thread)."""
+        try:
+            data = future.result()
+        except Exception as e:
+            leader.log(f"Error fetching data: {e}")
+            data = None
+        leader.thread_pool.start(FetchWorker(partial(self._deliver, key, data)))
+
+    def _on_process_done(self, key, leader, future):
+        """Deliver a result computed in the process pool (executor thread)."""
+        try:
+            data, empty = future.result()
+        except Exception as e:
+            leader.log(f"Error fetching data: {e}")
+            data, empty = None, True
+        # The results handler already ran in the worker process
+        self._deliver(key, data, handled=True, empty=empty)
+
+    def _deliver(self, key, data, handled=False, empty=None):
+        """
+        Apply each waiting widget's results handler and emit the result (pool thread).
+
+        `empty` tells whether the provider itself returned nothing (default: data is None);
+        those widgets get `fetch_empty` before the result.
+        """
+        with self._lock:
+            waiting = self._in_flight.pop(key, [])
+            replaying = self._replaying.get(key, {})
+            for widget in replaying:
+                replaying[widget] = True
+            # Widgets still replaying missed chunks get the stream's end from _replay
+            waiting = [widget for widget in waiting if widget not in replaying]
+        if empty is None:
+            empty = data is None
+
+        for widget in waiting:
+            result = data
+            if data is not None and not handled:
+                result = widget.handle_results(data)
+            if result is not None and widget.cache_ttl:
+                get_result_cache().put(self.cache_key(widget), result)
+            try:
+                if empty:
+                    widget.fetch_empty.emit()
+                widget.data_ready.emit(result)
+            except RuntimeError:
+                # The widget was destroyed while the fetch was running
+                pass
+
+
+_provider_bus = None
+
+
+def get_provider_bus():
+    """Return the application-wide provider bus."""
+    global _provider_bus
+    if _provider_bus is None:
+        _provider_bus = ProviderBus()
+    return _provider_bus
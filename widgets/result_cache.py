@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class ResultCache:
+    def __init__(self, max_entries=256):
+        """
+        LRU cache of provider results, keyed by the canonical provider call
+        (plus the results handler that processed them).
+
+        Entries never expire on their own; callers pass the TTL they accept and
+        get back whether the value is still fresh, so stale values can be shown
+        while a refresh runs (stale-while-revalidate).
+
+        Args:
+            max_entries (int): Maximum number of cached results.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key, ttl):
+        """
+        Look up a cached result.
+
+        Args:
+            key (str): Canonical provider key.
+            ttl (int): Time-to-live in milliseconds the caller accepts.
+
+        Returns:
+            tuple: (value, is_fresh); value is MISSING if nothing is cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING, False
+            self._entries.move_to_end(key)
+        value, stored_at = entry
+        return value, (time.monotonic() - stored_at) * 1000 < ttl
+
+    def put(self, key, value):
+        """Store a result, evicting the least recently used entries past the bound."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """Drop one cached result, or all of them when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_result_cache = None
+
+
+def get_result_cache():
+    """Return the application-wide result cache."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache()
+    return _result_cache
+
+
+def configure_result_cache(max_entries=256):
+    """Set the application-wide result cache size; call before widgets are created."""
+    get_result_cache().max_entries = max_entries
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+class RingBuffer:
+    def __init__(self, capacity, fill=None, dtype=np.float64):
+        """
+        Fixed-size history of numbers in a preallocated NumPy array.
+
+        Every value is written twice, at `i` and `i + capacity`, so the most
+        recent `capacity` values are always one contiguous slice: view() is
+        a zero-copy array in chronological order and appending is O(1).
+
+        Args:
+            capacity (int): Number of values kept.
+            fill (float): Start full of this value instead of empty (optional).
+            dtype: NumPy dtype of the values.
+        """
+        self.capacity = max(1, int(capacity))
+        self._data = np.zeros(2 * self.capacity, dtype=dtype)
+        self._head = 0
+        self._size = 0
+        if fill is not None:
+            self._data[:] = fill
+            self._size = self.capacity
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        """Add a value, dropping the oldest one when full."""
+        position = (self._head + self._size) % self.capacity
+        self._data[position] = value
+        self._data[position + self.capacity] = value
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._head = (self._head + 1) % self.capacity
+
+    def set_latest(self, value):
+        """Overwrite the most recent value."""
+        position = (self._head + self._size - 1) % self.capacity
+        self._data[position] = value
+        self._data[position + self.capacity] = value
+
+    def extend(self, values):
+        """Add several values in order."""
+        for value in values:
+            self.append(value)
+
+    def view(self):
+        """Return the values, oldest first, as a read-only array sharing the buffer."""
+        window = self._data[self._head:self._head + self._size]
+        window.flags.writeable = False
+        return window
+
+    def latest(self):
+        """Return the most recent value (None when empty)."""
+        if not self._size:
+            return None
+        return self._data[(self._head + self._size - 1) % self.capacity]
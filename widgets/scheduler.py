@@ -0,0 +1,151 @@
+import random
+import time
+from functools import partial
+from PySide6.QtCore import QObject, QTimer, Qt
+from shiboken6 import isValid
+
+
+class TickGroup:
+    """Callbacks sharing one interval, ticked together on aligned deadlines."""
+
+    __slots__ = ("interval", "offset", "next_due", "callbacks", "ticks", "missed")
+
+    def __init__(self, interval, offset, now):
+        self.interval = interval
+        self.offset = offset
+        # Align to multiples of the interval so groups with the same period tick together
+        self.next_due = (now // interval + 1) * interval + offset
+        self.callbacks = []
+        self.ticks = 0
+        self.missed = 0
+
+
+class TickScheduler(QObject):
+    def __init__(self, jitter=0, parent=None):
+        """
+        Drive every periodic widget update from a single timer.
+
+        Callbacks are grouped by interval; each group fires on deadlines aligned
+        to multiples of its interval, so widgets polling at the same rate tick in
+        the same event-loop pass (and share provider fetches). Only one QTimer is
+        armed, for the earliest pending deadline.
+
+        Args:
+            jitter (int): Maximum random phase offset in ms applied per group to spread load.
+            parent (QObject): Optional Qt parent.
+        """
+        super().__init__(parent)
+        self.jitter = jitter
+        self.groups = {}
+        self._intervals = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    @staticmethod
+    def now():
+        """Monotonic time in milliseconds."""
+        return int(time.monotonic() * 1000)
+
+    def add(self, callback, interval, owner=None):
+        """
+        Tick `callback` every `interval` ms.
+
+        Args:
+            callback (callable): Function called on each tick.
+            interval (int): Tick period in milliseconds.
+            owner (QObject): If given, the callback is removed when the owner is destroyed.
+        """
+        interval = int(interval)
+        if interval <= 0:
+            raise ValueError(f"Invalid tick interval: {interval}")
+        self._detach(callback)
+
+        group = self.groups.get(interval)
+        if group is None:
+            offset = random.randint(0, min(self.jitter, interval - 1)) if self.jitter else 0
+            group = TickGroup(interval, offset, self.now())
+            self.groups[interval] = group
+        group.callbacks.append(callback)
+        self._intervals[callback] = interval
+
+        if owner is not None:
+            owner.destroyed.connect(partial(self.remove, callback))
+        self._arm()
+
+    def set_interval(self, callback, interval):
+        """Move an already scheduled callback to a different interval."""
+        if self._intervals.get(callback) == int(interval):
+            return
+        self.add(callback, interval)
+
+    def remove(self, callback, *_):
+        """Stop ticking a callback."""
+        if self._detach(callback):
+            self._arm()
+
+    def _detach(self, callback):
+        """Remove a callback from its group; returns True if it was scheduled."""
+        interval = self._intervals.pop(callback, None)
+        if interval is None:
+            return False
+        group = self.groups[interval]
+        group.callbacks.remove(callback)
+        if not group.callbacks:
+            del self.groups[interval]
+        return True
+
+    def interval_of(self, callback):
+        """Return the interval a callback is scheduled at, or None."""
+        return self._intervals.get(callback)
+
+    def missed_ticks(self):
+        """Return the number of missed ticks per interval."""
+        return {interval: group.missed for interval, group in self.groups.items()}
+
+    def _arm(self):
+        """Arm the timer for the earliest pending deadline."""
+        if not isValid(self._timer):
+            # Widgets can outlive the scheduler during application teardown
+            return
+        if not self.groups:
+            self._timer.stop()
+            return
+        next_due = min(group.next_due for group in self.groups.values())
+        self._timer.start(max(0, next_due - self.now()))
+
+    def _on_timeout(self):
+        """Run every group whose deadline has passed."""
+        now = self.now()
+        for group in list(self.groups.values()):
+            if group.next_due > now:
+                continue
+            missed = (now - group.next_due) // group.interval
+            if missed:
+                group.missed += missed
+                print(f"[TickScheduler] Missed {missed} tick(s) of the {group.interval} ms group.")
+            group.next_due += (missed + 1) * group.interval
+            group.ticks += 1
+            for callback in list(group.callbacks):
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"[TickScheduler] Error in tick callback {callback}: {e}")
+        self._arm()
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    """Return the application-wide tick scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TickScheduler()
+    return _scheduler
+
+
+def configure_scheduler(jitter=0):
+    """Set application-wide scheduler options; call before widgets are created."""
+    get_scheduler().jitter = jitter
@@ -0,0 +1,203 @@
+import math
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen, QTransform
+from PySide6.QtWidgets import QWidget
+from widgets.base_widget import BaseWidget
+from widgets.ring_buffer import RingBuffer
+from widgets.window_stats import SlidingWindowStats
+
+
+class SparklineView(QWidget):
+    def __init__(self, capacity, color="#2a82da", line_width=1, min_y=0, show_value=True, height=24, parent=None):
+        """
+        A line of the latest `capacity` samples, painted directly with QPainter.
+
+        The path is cached in sample coordinates (x = sample number, y = value):
+        a new sample appends one segment, and scrolling and scaling are done by
+        the painter transform, so nothing is recomputed per frame. Once the path
+        holds two windows of segments it is rebuilt from the ring buffer.
+
+        Args:
+            capacity (int): Number of samples shown.
+            color (str): Line color.
+            line_width (int): Line width in pixels.
+            min_y (float): Smallest top of the value range.
+            show_value (bool): Draw the latest value in the top-right corner.
+            height (int): Preferred height in pixels.
+        """
+        super().__init__(parent)
+        self.capacity = max(2, int(capacity))
+        self.values = RingBuffer(self.capacity)
+        self.window = SlidingWindowStats(self.capacity)
+        self.count = 0
+        self.path = QPainterPath()
+        self.segments = 0
+        self.gap = True
+        self.min_y = min_y
+        self.show_value = show_value
+        self.preferred_height = height
+        self.pen = QPen(QColor(color), line_width)
+        # Keep the line width in pixels whatever the transform
+        self.pen.setCosmetic(True)
+        self.setAttribute(Qt.WA_OpaquePaintEvent, False)
+
+    def sizeHint(self):
+        return QSize(120, self.preferred_height)
+
+    def minimumSizeHint(self):
+        return QSize(20, 8)
+
+    def append(self, value):
+        """Add a sample; None (or NaN) leaves a gap in the line."""
+        index = self.count
+        self.count += 1
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            self.values.append(math.nan)
+            # Losses count as 0 so the value range still slides with the window
+            self.window.push(0.0)
+            self.gap = True
+        else:
+            value = float(value)
+            self.values.append(value)
+            self.window.push(value)
+            if self.gap:
+                self.path.moveTo(index, value)
+                self.gap = False
+            else:
+                self.path.lineTo(index, value)
+            self.segments += 1
+            if self.segments > 2 * self.capacity:
+                self.rebuild_path()
+        self.update()
+
+    def rebuild_path(self):
+        """Recreate the cached path from the samples still in the window."""
+        self.path = QPainterPath()
+        self.segments = 0
+        self.gap = True
+        first = self.count - len(self.values)
+        for offset, value in enumerate(self.values.view()):
+            if math.isnan(value):
+                self.gap = True
+                continue
+            if self.gap:
+                self.path.moveTo(first + offset, value)
+                self.gap = False
+            else:
+                self.path.lineTo(first + offset, value)
+            self.segments += 1
+
+    def transform(self, rect):
+        """Map sample coordinates onto the widget: the window fills the width, 0..top the height."""
+        top = max(self.window.maximum or 0, self.min_y) or 1
+        scale_x = rect.width() / (self.capacity - 1)
+        scale_y = rect.height() / top
+        oldest = self.count - self.capacity
+        return QTransform(scale_x, 0, 0, -scale_y, rect.left() - oldest * scale_x, rect.bottom())
+
+    def paintEvent(self, event):
+        if not self.count:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.rect().adjusted(1, 1, -1, -1)
+        painter.setClipRect(rect)
+        painter.setTransform(self.transform(rect))
+        painter.setPen(self.pen)
+        painter.drawPath(self.path)
+        if self.show_value:
+            latest = self.values.latest()
+            painter.resetTransform()
+            painter.setPen(self.palette().windowText().color())
+            text = "—" if math.isnan(latest) else f"{latest:.0f}"
+            painter.drawText(rect, Qt.AlignRight | Qt.AlignTop, text)
+        painter.end()
+
+
+class Sparkline(BaseWidget):
+    def __init__(
+        self,
+        max_points=60,
+        interval=1000,
+        data_provider=None,
+        results_handler=None,
+        alignment="center",
+        margins=None,
+        style=None,
+        min_y=0,
+        show_value=True,
+        *args,
+        **kwargs,
+    ):
+        """
+        Create a sparkline: a small chart of the latest samples, without axes.
+
+        Much lighter than a latency chart (no QChart, axes or QChartView), so
+        hundreds fit in one dashboard grid.
+
+        Args:
+            max_points: Number of samples shown.
+            interval: Update interval in milliseconds.
+            data_provider: A string specifying a function returning one sample (None for a gap).
+            results_handler: A string specifying a function to process data (optional).
+            alignment: Alignment of the widget.
+            margins: Margins for the widget.
+            style: "color", "line-width", "height" and "background" of the sparkline.
+            min_y: Smallest top of the value range (keeps quiet lines from filling the height).
+            show_value: Draw the latest value in the corner.
+        """
+        self.style = style or {}
+        super().__init__(
+            alignment=alignment,
+            margins=margins,
+            data_provider=data_provider,
+            results_handler=results_handler,
+            interval=interval,
+            widget_type="sparkline",
+            widget_name=kwargs.get("name"),
+            *args,
+            **kwargs,
+        )
+        self.view = SparklineView(
+            max_points,
+            color=self.style.get("color", "#2a82da"),
+            line_width=int(self.style.get("line-width", 1)),
+            min_y=min_y,
+            show_value=show_value,
+            height=int(str(self.style.get("height", 24)).rstrip("px")),
+        )
+        if "background" in self.style:
+            self.view.setStyleSheet(f"background: {self.style['background']};")
+            self.view.setAttribute(Qt.WA_StyledBackground, True)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.add_child_widget(self.view)
+
+    def on_data_fetched(self, data):
+        """Append the fetched sample."""
+        self.append_sample(data)
+
+    def on_data_chunk(self, chunk):
+        """Append the sample(s) of one streamed chunk."""
+        for value in chunk if isinstance(chunk, list) else [chunk]:
+            self.append_sample(value)
+
+    def on_cached_result(self, data):
+        """A cached result is not a new sample; the line already shows it."""
+        self.hide_loading()
+
+    def on_worker_result(self, data):
+        """A finished fetch without a result leaves a gap."""
+        lost = data is None and not self.streaming
+        super().on_worker_result(data)
+        if lost:
+            self.view.append(None)
+
+    def on_worker_error(self, message):
+        super().on_worker_error(message)
+        self.view.append(None)
+
+    def append_sample(self, data):
+        if data is None or isinstance(data, (int, float)):
+            self.view.append(data)
+        else:
+            self.log("Invalid data type received for sparkline.")
@@ -1,9 +1,21 @@
-from PySide6.QtCore import QTimer, Qt
-from PySide6.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView, QLabel, QVBoxLayout
-from PySide6.QtGui import QColor, QBrush
+import inspect
+import time
+from functools import partial
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QTableView, QHeaderView
+from widgets.async_bridge import get_async_bridge
 from widgets.base_widget import BaseWidget
+from widgets.callables import compile_callable
+from widgets.cell_style import CompiledCellStyle
+from widgets.paged_model import PagedTableModel
+from widgets.table_model import ColumnarTableModel, is_columnar
+from widgets.table_proxy import SortFilterProxy
+from widgets.worker import FetchWorker
 
 class Table(BaseWidget):
+    # (page, generation, rows, total) of a page fetched on the thread pool
+    page_ready = Signal(object)
+
     def __init__(
         self,
         data=None,
@@ -14,6 +26,12 @@ class Table(BaseWidget):
         alignment="center",
         margins=None,
         style=None,
+        key=None,
+        sort=None,
+        filter=None,
+        page_provider=None,
+        page_size=100,
+        max_pages=20,
         *args,
         **kwargs,
     ):
@@ -29,13 +47,55 @@ class Table(BaseWidget):
             alignment: Alignment of the widget.
             margins: Margins for the widget.
             style: CSS-like styles for the widget.
+            key: Data key identifying a row across refreshes, so only changed cells update (optional).
+            sort: {"column": key, "order": "ascending" | "descending"} initial sort (optional).
+            filter: {"column": key, "value": "<condition>"} or a list of them; rows must match all (optional).
+            page_provider: A string specifying a function called with (offset, limit) that returns
+                one page of rows, or {"rows": [...], "total": n} (optional).
+            page_size: Rows fetched per page by the page provider.
+            max_pages: Number of pages kept in memory by the page provider.
         """
-        self.table = QTableWidget()
-        self.columns = columns
+        self.table = QTableView()
+        self.columns = columns or {}
+        self.key = key
+        self.style = style or {}
+        # Conditional cell styles are compiled once into per-column predicates
+        self.cell_style = CompiledCellStyle(self.style.get("cell_style"), self.columns)
+        self.stream_keys = set()
+        self.proxy = None
+        self.page_provider = page_provider
+        if page_provider:
+            # Pages are fetched on demand as the view scrolls; sorting and keys belong to the provider
+            if sort or filter or key:
+                print("Table: sort, filter and key are not applied to paged tables.")
+            self.model = PagedTableModel(
+                self.columns,
+                self.request_page,
+                page_size=page_size,
+                max_pages=max_pages,
+                cell_style=self.cell_style,
+            )
+            self.table.setModel(self.model)
+        elif sort or filter:
+            if sort and not key:
+                print("Table: set `key` so refreshes re-sort only the changed rows instead of every row.")
+            self.model = ColumnarTableModel(self.columns, cell_style=self.cell_style, key=key)
+            # Sorting and filtering happen in a proxy over cached typed keys
+            sort = sort or {}
+            filters = filter if isinstance(filter, list) else [filter] if filter else []
+            self.proxy = SortFilterProxy(
+                self.model,
+                sort_column=sort.get("column"),
+                descending=sort.get("order") == "descending",
+                filters=filters,
+            )
+            self.table.setModel(self.proxy)
+        else:
+            self.model = ColumnarTableModel(self.columns, cell_style=self.cell_style, key=key)
+            self.table.setModel(self.model)
         self.data_provider = data_provider
         self.interval = interval
         self.results_handler = results_handler
-        self.style = style or {}
 
         # Initialize BaseWidget
         super().__init__(
@@ -43,6 +103,7 @@ class Table(BaseWidget):
             margins=margins,
             data_provider=data_provider,
             results_handler=results_handler,
+            interval=interval if data_provider or page_provider else None,
             *args,
             **kwargs,
         )
@@ -55,35 +116,98 @@ class Table(BaseWidget):
         # Apply table styles
         self.apply_table_styles()
 
-        # Adjust table settings
+        # Adjust table settings; fixed row heights keep large tables cheap to lay out
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        if self.proxy is not None:
+            self.enable_sorting()
 
-        # Schedule initial data fetch
-        if data_provider:
-            self.fetch_data()  # Ensure asynchronous fetching
-        elif data:
-            self.populate_table(data)
+        if page_provider:
+            self.page_ready.connect(self.on_page_ready, Qt.QueuedConnection)
+            try:
+                compile_callable(page_provider)
+            except Exception as e:
+                self.log(f"Error compiling {page_provider!r}: {e}")
 
-        # Start refresh timer if interval is provided
-        if interval and data_provider:
-            self.timer = QTimer()
-            self.timer.timeout.connect(self.fetch_data)
-            self.timer.start(interval)
+        # The initial fetch is already scheduled on the thread pool by BaseWidget
+        if data and not data_provider and not page_provider:
+            self.process_data(data)
 
     def apply_table_styles(self):
         """Apply table-specific styles."""
         padding = self.style.get("padding", "0px")  # Default to no padding
         stylesheet = f"""
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: {padding};
             }}
         """
         self.table.setStyleSheet(stylesheet)
 
+    def enable_sorting(self):
+        """Let header clicks re-sort, starting from the configured sort column."""
+        header = self.table.horizontalHeader()
+        if self.proxy.sort_key in self.model.keys:
+            order = Qt.DescendingOrder if self.proxy.descending else Qt.AscendingOrder
+            header.setSortIndicator(self.model.keys.index(self.proxy.sort_key), order)
+        else:
+            header.setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+
+    def defer_data_fetching(self):
+        """Paged tables refresh the pages in view; other tables fetch through BaseWidget."""
+        if self.page_provider:
+            if self.model.pending:
+                # A refresh would discard the pages still on their way
+                self.skipped_ticks += 1
+                return
+            self.model.refresh()
+            return
+        super().defer_data_fetching()
+
+    def request_page(self, page, generation):
+        """Fetch one page on the thread pool (called by the paged model)."""
+        worker = FetchWorker(partial(self.fetch_page, page, generation), self.page_ready)
+        self.thread_pool.start(worker)
+
+    def fetch_page(self, page, generation):
+        """Call the page provider and results handler for one page (runs on a pool thread)."""
+        offset = page * self.model.page_size
+        started = time.monotonic()
+        try:
+            result = compile_callable(self.page_provider)(offset, self.model.page_size)
+            if inspect.isawaitable(result):
+                result = get_async_bridge().run(result)
+        except Exception as e:
+            self.log(f"Error fetching page {page}: {e}")
+            return page, generation, None, None, (time.monotonic() - started) * 1000
+        latency = (time.monotonic() - started) * 1000
+
+        total = None
+        if isinstance(result, dict):
+            total = result.get("total")
+            result = result.get("rows", [])
+        rows = self.handle_results(list(result or []))
+        return page, generation, rows, total, latency
+
+    def on_page_ready(self, result):
+        """Store a fetched page in the model on the GUI thread."""
+        page, generation, rows, total, latency = result
+        # Slow pages stretch the refresh interval like slow fetches do
+        self.adapt_interval(latency)
+        if rows is None:
+            self.model.fail_page(page, generation)
+            return
+        self.model.set_page(page, rows, total, generation)
+        self.show_table()
+
+    def on_data_fetched(self, data):
+        """Populate the table with data delivered from the thread pool."""
+        self.process_data(data)
+
     def process_data(self, data):
-        """Process the fetched data and populate the table."""
-        if not isinstance(data, list):
-            print("Expected data to be a list, but got:", type(data))
+        """Process the fetched data (a list of rows or a columnar batch) and populate the table."""
+        if not isinstance(data, list) and not is_columnar(data):
+            print("Expected data to be a list or a dict of columns, but got:", type(data))
             return
 
         # Populate the table with processed data
@@ -92,90 +216,46 @@ class Table(BaseWidget):
 
     def populate_table(self, data):
         """Populate the table with data."""
-        # Ensure columns are a dictionary of key-value pairs
-        header_mapping = self.columns.keys()
-        header_labels = self.columns.values()
-
-        # Configure table dimensions and headers
-        self.table.setColumnCount(len(header_labels))
-        self.table.setHorizontalHeaderLabels(header_labels)
-        self.table.setRowCount(len(data))
-
-        print("Populating table with data...", header_labels, len(data))
-
-        # Populate the table using the key-value mapping
-        for row_idx, row_data in enumerate(data):
-            for col_idx, (data_key, column_header) in enumerate(self.columns.items()):
-                # Match data_key with keys in row_data
-                value = str(row_data.get(data_key, ""))
-                item = QTableWidgetItem(value)
-                print(f"Setting item at ({row_idx}, {col_idx}): {value}, header: {column_header}")
-                self.apply_cell_style(item, column_header, value)
-                self.table.setItem(row_idx, col_idx, item)
-
-        # Trigger table redraw
-        self.table.viewport().update()
-
-    def apply_cell_style(self, item, column, value):
-        """Apply styles to a table cell."""
-        cell_style = self.style.get("cell_style", {})
-        default_style = cell_style.get("default", {})
-        conditions = cell_style.get("conditions", [])
-
-        # Apply default styles
-        if "background-color" in default_style:
-            item.setBackground(QBrush(QColor(default_style["background-color"])))
-        if "color" in default_style:
-            item.setForeground(QBrush(QColor(default_style["color"])))
-        if "alignment" in default_style:
-            alignment = self.parse_alignment(default_style["alignment"])
-            item.setTextAlignment(alignment)
-
-        # Apply conditional styles
-        for condition in conditions:
-            if condition.get("column") == column:
-                condition_value = condition.get("value", None)
-                if self.meets_condition(value, condition_value):
-                    if "background-color" in condition:
-                        item.setBackground(QBrush(QColor(condition["background-color"])))
-                    if "color" in condition:
-                        item.setForeground(QBrush(QColor(condition["color"])))
-
-    def meets_condition(self, value, condition_value):
-        """
-        Check if the value meets the condition.
-
-        Supported conditions:
-        - ">X" : Greater than X
-        - "<X" : Less than X
-        - ">=X" : Greater than or equal to X
-        - "<=X" : Less than or equal to X
-        - "==X" : Equal to X
-        - "!=X" : Not equal to X
-        """
-        try:
-            # Attempt to interpret value as a number if condition is numeric
-            value = float(value) if isinstance(value, (int, float, str)) and value.isdigit() else value
-        except ValueError:
-            pass
-
-        if isinstance(condition_value, str):
-            # Handle comparison operators
-            if condition_value.startswith(">="):
-                return float(value) >= float(condition_value[2:])
-            elif condition_value.startswith("<="):
-                return float(value) <= float(condition_value[2:])
-            elif condition_value.startswith(">"):
-                return float(value) > float(condition_value[1:])
-            elif condition_value.startswith("<"):
-                return float(value) < float(condition_value[1:])
-            elif condition_value.startswith("=="):
-                return value == condition_value[2:]
-            elif condition_value.startswith("!="):
-                return value != condition_value[2:]
-
-        # Exact match
-        return value == condition_value
+        print("Populating table with data...", self.model.headers, len(data))
+        if is_columnar(data):
+            # Columns are stored as given; cells are formatted only when painted
+            self.model.set_columns(data)
+        elif self.key:
+            # Diff by key so unchanged rows, selection and scroll position are kept
+            self.model.update_rows(data)
+            if self.proxy is not None:
+                # Re-sort the refresh's changed rows together, now rather than on the next event
+                self.proxy.flush_changes()
+        else:
+            self.model.set_rows(data)
+
+    def on_stream_started(self):
+        """Start an incremental refresh; keyed tables keep their rows until the stream ends."""
+        if self.key:
+            self.stream_keys = set()
+        else:
+            self.model.clear()
+        self.show_table()
+
+    def on_data_chunk(self, chunk):
+        """Append (or, for keyed tables, upsert) the row(s) of one streamed chunk."""
+        if is_columnar(chunk):
+            if not self.key:
+                self.model.append_columns(chunk)
+                return
+            # Keyed streams upsert row by row
+            chunk = self.model.batch_rows(chunk)
+        rows = chunk if isinstance(chunk, list) else [chunk]
+        if self.key:
+            self.stream_keys.update(row.get(self.key) for row in rows)
+            self.model.upsert_rows(rows)
+        else:
+            self.model.append_rows(rows)
+
+    def on_stream_finished(self):
+        """Drop keyed rows that were not seen during the stream."""
+        if self.key:
+            self.model.retain_keys(self.stream_keys)
 
     def show_table(self):
         """Show the table and hide the loading indicator."""
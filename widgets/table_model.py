@@ -0,0 +1,308 @@
+import numpy as np
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+STYLE_ROLES = (Qt.BackgroundRole, Qt.ForegroundRole, Qt.TextAlignmentRole)
+
+
+def is_columnar(data):
+    """Return True for a columnar batch: a dict mapping column keys to sequences or buffers."""
+    return isinstance(data, dict) and all(
+        hasattr(values, "__len__") and not isinstance(values, (str, bytes, dict))
+        for values in data.values()
+    )
+
+
+def as_column(values):
+    """
+    Return a column as stored by the model, without copying.
+
+    Lists are kept as they are; NumPy arrays are used directly and other
+    buffer-protocol / array-like columns are wrapped as NumPy arrays.
+    """
+    if isinstance(values, (list, np.ndarray)):
+        return values
+    if isinstance(values, tuple):
+        return list(values)
+    return np.asarray(values)
+
+
+class ColumnarTableModel(QAbstractTableModel):
+    def __init__(self, columns, cell_style=None, key=None, parent=None):
+        """
+        Table model that keeps its rows as one list or NumPy array per column.
+
+        Display text is only formatted for the cells the view paints, so
+        columnar batches (dicts of arrays) are displayed without building a
+        Python object per value. Cell styles
+        are evaluated column-at-a-time when data changes and stored as one small
+        style index per cell.
+
+        Args:
+            columns (dict): Mapping of data key to header label.
+            cell_style (CompiledCellStyle): Compiled conditional styles (optional).
+            key (str): Data key identifying a row across refreshes, enabling keyed diffing (optional).
+            parent (QObject): Optional Qt parent.
+        """
+        super().__init__(parent)
+        self.keys = list(columns.keys())
+        self.headers = list(columns.values())
+        self.column_data = {key: [] for key in self.keys}
+        self.row_count = 0
+        self.cell_style = cell_style
+        self.key = key
+        # Column key -> array of style indices, for columns that have style rules
+        self.style_index = {key: np.zeros(0, dtype=np.uint16) for key in self.styled_keys()}
+        # Key of every row (the key column need not be displayed) and key -> row position
+        self.row_keys = []
+        self.row_index = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.keys)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def value(self, row, column):
+        """Return the raw value of a cell."""
+        return self.column_data[self.keys[column]][row]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        key = self.keys[index.column()]
+        value = self.column_data[key][index.row()]
+        if role == Qt.DisplayRole:
+            return str(value)
+        if self.cell_style is not None and role in STYLE_ROLES:
+            styles = self.style_index.get(key)
+            style = styles[index.row()] if styles is not None else 0
+            return self.cell_style.styles[style].get(role)
+        return None
+
+    def styled_keys(self):
+        """Return the column keys that have style rules."""
+        if self.cell_style is None:
+            return []
+        return [key for key in self.keys if self.cell_style.has_rules(key)]
+
+    def restyle(self):
+        """Re-evaluate the style rules of every styled column."""
+        self.style_index = {
+            key: self.cell_style.evaluate(key, self.column_data[key]) for key in self.styled_keys()
+        }
+
+    def evaluate_styles(self, new_columns):
+        """Evaluate the style rules of values about to be appended (before the model changes)."""
+        return {key: self.cell_style.evaluate(key, new_columns[key]) for key in self.styled_keys()}
+
+    def extend_styles(self, new_styles):
+        """Add the styles returned by evaluate_styles() to the style arrays."""
+        for key, styles in new_styles.items():
+            current = self.style_index.get(key, np.zeros(0, dtype=np.uint16))
+            self.style_index[key] = np.concatenate((current, styles))
+
+    def mutable(self, key):
+        """Return a column as a list, converting an array column for row-wise edits."""
+        values = self.column_data[key]
+        if not isinstance(values, list):
+            values = self.column_data[key] = values.tolist()
+        return values
+
+    def batch_columns(self, batch):
+        """Turn a columnar batch into the model's columns (missing keys become empty)."""
+        lengths = {len(values) for values in batch.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columnar batch has columns of different lengths: {sorted(lengths)}")
+        count = lengths.pop() if lengths else 0
+        columns = {
+            key: as_column(batch[key]) if key in batch else [""] * count for key in self.keys
+        }
+        return columns, count
+
+    def batch_rows(self, batch):
+        """Turn a columnar batch into a list of row dicts."""
+        columns, count = self.batch_columns(batch)
+        if self.key is not None and self.key not in columns:
+            columns[self.key] = as_column(batch.get(self.key, [None] * count))
+        lists = {
+            key: values.tolist() if isinstance(values, np.ndarray) else values
+            for key, values in columns.items()
+        }
+        return [{key: values[i] for key, values in lists.items()} for i in range(count)]
+
+    def split_columns(self, rows):
+        """Turn a list of row dicts into one list per column."""
+        return {key: [row.get(key, "") for row in rows] for key in self.keys}
+
+    def set_rows(self, rows):
+        """Replace every row."""
+        self.beginResetModel()
+        self.column_data = self.split_columns(rows)
+        self.row_count = len(rows)
+        self.restyle()
+        if self.key is not None:
+            self.row_keys = [row.get(self.key) for row in rows]
+            self.row_index = {row_key: i for i, row_key in enumerate(self.row_keys)}
+        self.endResetModel()
+
+    def set_columns(self, batch):
+        """Replace every row with a columnar batch ({key: array or sequence})."""
+        columns, count = self.batch_columns(batch)
+        self.beginResetModel()
+        self.column_data = columns
+        self.row_count = count
+        self.restyle()
+        if self.key is not None:
+            row_keys = batch.get(self.key, [None] * count)
+            self.row_keys = row_keys.tolist() if isinstance(row_keys, np.ndarray) else list(row_keys)
+            self.row_index = {row_key: i for i, row_key in enumerate(self.row_keys)}
+        self.endResetModel()
+
+    def append_columns(self, batch):
+        """Append a columnar batch at the end of the table."""
+        columns, count = self.batch_columns(batch)
+        if not count:
+            return
+        new_styles = self.evaluate_styles(columns)
+        self.beginInsertRows(QModelIndex(), self.row_count, self.row_count + count - 1)
+        for key, values in columns.items():
+            current = self.column_data[key]
+            if isinstance(values, np.ndarray) and not len(current):
+                self.column_data[key] = values
+            elif isinstance(current, np.ndarray) and isinstance(values, np.ndarray):
+                self.column_data[key] = np.concatenate((current, values))
+            else:
+                self.mutable(key).extend(values.tolist() if isinstance(values, np.ndarray) else values)
+        self.extend_styles(new_styles)
+        if self.key is not None:
+            row_keys = batch.get(self.key, [None] * count)
+            for row_key in (row_keys.tolist() if isinstance(row_keys, np.ndarray) else row_keys):
+                self.row_index[row_key] = len(self.row_keys)
+                self.row_keys.append(row_key)
+        self.row_count += count
+        self.endInsertRows()
+
+    def update_rows(self, rows):
+        """
+        Apply a full refresh by key: insert new rows, remove missing ones and
+        emit dataChanged only for cells whose value changed.
+
+        Existing rows keep their position, so selection and scroll survive.
+        """
+        self.upsert_rows(rows)
+        self.retain_keys({row.get(self.key) for row in rows})
+
+    def upsert_rows(self, rows):
+        """Update rows whose key already exists and append the others."""
+        new_rows = []
+        # Key -> index in new_rows; row_index only learns the keys once the rows exist
+        pending = {}
+        # Adjacent changed rows are reported as one dataChanged range
+        changed = None
+        for row in rows:
+            row_key = row.get(self.key)
+            if row_key in pending:
+                # The same key twice in one refresh: the last row wins
+                new_rows[pending[row_key]] = row
+                continue
+            position = self.row_index.get(row_key)
+            if position is None:
+                pending[row_key] = len(new_rows)
+                new_rows.append(row)
+                continue
+            first = last = None
+            for column, key in enumerate(self.keys):
+                value = row.get(key, "")
+                values = self.column_data[key]
+                if values[position] != value:
+                    values = self.mutable(key)
+                    values[position] = value
+                    if key in self.style_index:
+                        self.style_index[key][position] = self.cell_style.evaluate(key, [value])[0]
+                    if first is None:
+                        first = column
+                    last = column
+            if first is None:
+                continue
+            if changed and changed[1] == position - 1:
+                changed = [changed[0], position, min(changed[2], first), max(changed[3], last)]
+            else:
+                self.emit_changed(changed)
+                changed = [position, position, first, last]
+        self.emit_changed(changed)
+
+        if new_rows:
+            new_columns = self.split_columns(new_rows)
+            new_styles = self.evaluate_styles(new_columns)
+            start = self.row_count
+            self.beginInsertRows(QModelIndex(), start, start + len(new_rows) - 1)
+            for key, values in new_columns.items():
+                self.mutable(key).extend(values)
+            self.extend_styles(new_styles)
+            self.row_keys.extend(pending)
+            self.row_count += len(new_rows)
+            self.endInsertRows()
+            for row_key, offset in pending.items():
+                self.row_index[row_key] = start + offset
+
+    def emit_changed(self, changed):
+        """Emit dataChanged for a [first_row, last_row, first_column, last_column] range, if any."""
+        if changed:
+            self.dataChanged.emit(self.index(changed[0], changed[2]), self.index(changed[1], changed[3]))
+
+    def retain_keys(self, keys):
+        """Remove every row whose key is not in `keys`, and duplicate rows of a key."""
+        # A key can appear at several positions (e.g. after set_rows); keep the indexed one
+        removed = [
+            position for position in range(len(self.row_keys) - 1, -1, -1)
+            if self.row_keys[position] not in keys
+            or self.row_index.get(self.row_keys[position]) != position
+        ]
+        if not removed:
+            return
+        # Remove contiguous runs from the bottom up so earlier positions stay valid
+        start = end = removed[0]
+        for position in removed[1:] + [None]:
+            if position is not None and position == start - 1:
+                start = position
+                continue
+            self.beginRemoveRows(QModelIndex(), start, end)
+            for key, values in self.column_data.items():
+                if isinstance(values, np.ndarray):
+                    self.column_data[key] = np.delete(values, np.s_[start:end + 1])
+                else:
+                    del values[start:end + 1]
+            for key, styles in self.style_index.items():
+                self.style_index[key] = np.delete(styles, np.s_[start:end + 1])
+            del self.row_keys[start:end + 1]
+            self.row_count -= end - start + 1
+            self.endRemoveRows()
+            if position is not None:
+                start = end = position
+        self.row_index = {row_key: i for i, row_key in enumerate(self.row_keys)}
+
+    def append_rows(self, rows):
+        """Append rows at the end of the table."""
+        if not rows:
+            return
+        new_columns = self.split_columns(rows)
+        new_styles = self.evaluate_styles(new_columns)
+        self.beginInsertRows(QModelIndex(), self.row_count, self.row_count + len(rows) - 1)
+        for key, values in new_columns.items():
+            self.mutable(key).extend(values)
+        self.extend_styles(new_styles)
+        if self.key is not None:
+            for row in rows:
+                self.row_index[row.get(self.key)] = len(self.row_keys)
+                self.row_keys.append(row.get(self.key))
+        self.row_count += len(rows)
+        self.endInsertRows()
+
+    def clear(self):
+        """Remove every row."""
+        self.set_rows([])
@@ -0,0 +1,324 @@
+import numpy as np
+from PySide6.QtCore import QAbstractProxyModel, QModelIndex, Qt, QTimer
+from widgets.cell_style import Condition, column_arrays, to_float_array
+
+# Larger inserts are applied with a model reset instead of row by row
+INCREMENTAL_INSERT_LIMIT = 256
+# Refreshes changing more rows are re-sorted with one argsort instead of row by row
+INCREMENTAL_CHANGE_LIMIT = 32
+
+
+class SortFilterProxy(QAbstractProxyModel):
+    def __init__(self, source, sort_column=None, descending=False, filters=None, parent=None):
+        """
+        Sort and filter proxy over a ColumnarTableModel.
+
+        The type of the sort column (numeric or text) is inferred once, and the
+        typed sort keys are cached per source row. A full sort is one NumPy
+        argsort; afterwards only rows that are inserted, removed or changed are
+        re-positioned (binary search). Changed rows are collected over a whole
+        refresh and moved together; when many rows changed, they are re-sorted
+        with a single argsort instead.
+
+        Args:
+            source (ColumnarTableModel): The model to sort and filter.
+            sort_column (str): Data key to sort by (optional).
+            descending (bool): Sort in descending order.
+            filters (list): [{"column": key, "value": "<condition>"}] rows must all match (optional).
+            parent (QObject): Optional Qt parent.
+        """
+        super().__init__(parent)
+        self.sort_key = sort_column
+        self.descending = descending
+        self.filters = [
+            (f["column"], Condition(f.get("value"))) for f in (filters or []) if f.get("column")
+        ]
+        self.numeric = None
+        self.order = np.zeros(0, dtype=np.int64)
+        self.position = np.zeros(0, dtype=np.int64)
+        self.sort_keys = np.zeros(0, dtype=object)
+        self.accepted = np.zeros(0, dtype=bool)
+        self.resetting = False
+        # Source rows changed since the last flush_changes()
+        self.dirty = set()
+        self.flush_scheduled = False
+        self.setSourceModel(source)
+
+    def setSourceModel(self, source):
+        super().setSourceModel(source)
+        source.modelReset.connect(self.on_source_reset)
+        source.layoutChanged.connect(self.on_source_reset)
+        source.rowsInserted.connect(self.on_rows_inserted)
+        source.rowsAboutToBeRemoved.connect(self.on_rows_about_to_be_removed)
+        source.rowsRemoved.connect(self.on_rows_removed)
+        source.dataChanged.connect(self.on_data_changed)
+        self.on_source_reset()
+
+    # --- QAbstractProxyModel interface ---
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self.order)):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(int(self.order[proxy_index.row()]), proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = self.position[source_index.row()]
+        return self.index(int(row), source_index.column()) if row >= 0 else QModelIndex()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort by a column index (used by clickable headers)."""
+        self.sort_key = self.sourceModel().keys[column] if column >= 0 else None
+        self.descending = order == Qt.DescendingOrder
+        self.numeric = None
+
+        self.sort_keys = self.typed_keys(self.source_column(self.sort_key))
+        self.dirty.clear()
+        self.relayout()
+
+    def relayout(self):
+        """Re-sort every accepted row with one argsort, keeping persistent indexes (selection) on their rows."""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [self.mapToSource(index) for index in persistent]
+        self.rebuild_order()
+        self.changePersistentIndexList(persistent, [self.mapFromSource(index) for index in sources])
+        self.layoutChanged.emit()
+
+    # --- typed keys and filtering ---
+
+    def source_column(self, key):
+        source = self.sourceModel()
+        values = source.column_data.get(key)
+        return values if values is not None else [""] * source.rowCount()
+
+    def typed_keys(self, values):
+        """Convert values to sort keys, inferring the column type on first use."""
+        if self.sort_key is None:
+            return np.zeros(len(values), dtype=np.float64)
+        numbers = to_float_array(values)
+        if self.numeric is None and isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+            self.numeric = True
+        if self.numeric is None and len(values):
+            # Numeric when every non-empty value parses as a number
+            non_empty = np.array([value not in ("", None) for value in values], dtype=bool)
+            self.numeric = bool(non_empty.any()) and not np.isnan(numbers[non_empty]).any()
+        if self.numeric:
+            # Non-numeric cells sort below every number
+            return np.where(np.isnan(numbers), -np.inf, numbers)
+        return np.array([str(value).lower() for value in values], dtype=object)
+
+    def accepts(self, start, stop):
+        """Evaluate the filters for source rows [start, stop) at once."""
+        mask = np.ones(stop - start, dtype=bool)
+        for key, condition in self.filters:
+            mask &= condition.evaluate(*column_arrays(self.source_column(key)[start:stop]))
+        return mask
+
+    def rebuild_order(self):
+        """Sort every accepted row (one argsort) and rebuild the inverse mapping."""
+        candidates = np.flatnonzero(self.accepted)
+        order = candidates[np.argsort(self.sort_keys[candidates], kind="stable")]
+        self.order = order[::-1].copy() if self.descending else order
+        self.update_positions()
+
+    def update_positions(self, start=None, stop=None):
+        """Rebuild the source -> proxy mapping, or only for proxy rows [start, stop)."""
+        if start is None:
+            self.position = np.full(len(self.accepted), -1, dtype=np.int64)
+            self.position[self.order] = np.arange(len(self.order))
+            return
+        self.position[self.order[start:stop]] = np.arange(start, stop)
+
+    def find_position(self, key):
+        """Return where a row with `key` belongs in the current order."""
+        ordered = self.sort_keys[self.order]
+        if self.descending:
+            return len(ordered) - int(np.searchsorted(ordered[::-1], key, side="left"))
+        return int(np.searchsorted(ordered, key, side="right"))
+
+    def insert_row(self, source_row):
+        position = self.find_position(self.sort_keys[source_row])
+        self.beginInsertRows(QModelIndex(), position, position)
+        self.order = np.insert(self.order, position, source_row)
+        self.update_positions(position, len(self.order))
+        self.endInsertRows()
+
+    def remove_row(self, source_row):
+        position = int(self.position[source_row])
+        self.beginRemoveRows(QModelIndex(), position, position)
+        self.order = np.delete(self.order, position)
+        self.position[source_row] = -1
+        self.update_positions(position, len(self.order))
+        self.endRemoveRows()
+
+    # --- source model signals ---
+
+    def on_source_reset(self):
+        self.dirty.clear()
+        self.beginResetModel()
+        rows = self.sourceModel().rowCount()
+        self.sort_keys = self.typed_keys(self.source_column(self.sort_key))
+        self.accepted = self.accepts(0, rows)
+        self.rebuild_order()
+        self.endResetModel()
+
+    def on_rows_inserted(self, parent, first, last):
+        self.flush_changes()
+        new_keys = self.typed_keys(self.source_column(self.sort_key)[first:last + 1])
+        # Keep the dtype of the inferred type (the keys of an empty table start untyped)
+        self.sort_keys = np.concatenate((self.sort_keys, new_keys)).astype(new_keys.dtype)
+        self.accepted = np.concatenate((self.accepted, self.accepts(first, last + 1)))
+
+        new_rows = np.flatnonzero(self.accepted[first:last + 1]) + first
+        if len(new_rows) > INCREMENTAL_INSERT_LIMIT:
+            self.beginResetModel()
+            self.rebuild_order()
+            self.endResetModel()
+            return
+        self.update_positions()
+        for source_row in new_rows:
+            self.insert_row(int(source_row))
+
+    def on_rows_about_to_be_removed(self, parent, first, last):
+        # Pending changes refer to source rows as they are before the removal
+        self.flush_changes()
+        positions = self.position[first:last + 1]
+        positions = np.sort(positions[positions >= 0])[::-1]
+        if len(positions) > INCREMENTAL_INSERT_LIMIT:
+            # Finished in on_rows_removed, once the source rows are gone
+            self.resetting = True
+            self.beginResetModel()
+            return
+        self.remove_positions(positions)
+
+    def remove_positions(self, positions):
+        """Remove proxy rows given in descending order, one contiguous run at a time."""
+        breaks = np.flatnonzero(np.diff(positions) != -1) + 1
+        for run in np.split(positions, breaks):
+            if len(run):
+                start, end = int(run[-1]), int(run[0])
+                self.beginRemoveRows(QModelIndex(), start, end)
+                self.position[self.order[start:end + 1]] = -1
+                self.order = np.delete(self.order, np.s_[start:end + 1])
+                self.update_positions(start, len(self.order))
+                self.endRemoveRows()
+
+    def on_rows_removed(self, parent, first, last):
+        count = last - first + 1
+        self.sort_keys = np.delete(self.sort_keys, np.s_[first:last + 1])
+        self.accepted = np.delete(self.accepted, np.s_[first:last + 1])
+        if self.resetting:
+            self.rebuild_order()
+            self.resetting = False
+            self.endResetModel()
+            return
+        self.order[self.order > last] -= count
+        self.update_positions()
+
+    def on_data_changed(self, top_left, bottom_right, roles=()):
+        """Update the cached keys of changed rows; their new places are applied by flush_changes()."""
+        first, last = top_left.row(), bottom_right.row()
+        if self.sort_key is not None:
+            self.sort_keys[first:last + 1] = self.typed_keys(
+                self.source_column(self.sort_key)[first:last + 1]
+            )
+        self.accepted[first:last + 1] = self.accepts(first, last + 1)
+        self.dirty.update(range(first, last + 1))
+
+        for source_row in range(first, last + 1):
+            row = int(self.position[source_row])
+            if row >= 0:
+                self.dataChanged.emit(self.index(row, top_left.column()), self.index(row, bottom_right.column()))
+
+        if not self.flush_scheduled:
+            # A keyed refresh emits dataChanged row by row; move them once it is done
+            self.flush_scheduled = True
+            QTimer.singleShot(0, self.flush_changes)
+
+    def flush_changes(self):
+        """Move, insert or remove the rows changed since the last call."""
+        self.flush_scheduled = False
+        if not self.dirty:
+            return
+        rows = np.fromiter(self.dirty, dtype=np.int64, count=len(self.dirty))
+        self.dirty.clear()
+        shown = self.position[rows] >= 0
+        accepted = self.accepted[rows]
+        leaving, entering, staying = rows[shown & ~accepted], rows[accepted & ~shown], rows[shown & accepted]
+
+        if len(rows) > INCREMENTAL_CHANGE_LIMIT:
+            # Filtered-out rows leave in runs and new ones are appended, then one
+            # argsort orders everything; selection follows its rows throughout
+            self.remove_positions(np.sort(self.position[leaving])[::-1])
+            if len(entering):
+                start = len(self.order)
+                self.beginInsertRows(QModelIndex(), start, start + len(entering) - 1)
+                self.order = np.concatenate((self.order, entering))
+                self.update_positions(start, len(self.order))
+                self.endInsertRows()
+            self.relayout()
+            return
+
+        for source_row in leaving:
+            self.remove_row(int(source_row))
+        for source_row in staying:
+            self.reposition_row(int(source_row))
+        for source_row in entering:
+            self.insert_row(int(source_row))
+        # Rows moved one at a time can land next to another changed row that had
+        # not moved yet; one vectorized check catches that
+        if not self.is_sorted():
+            self.relayout()
+
+    def is_sorted(self):
+        """Return True when the proxy rows are in sort order."""
+        ordered = self.sort_keys[self.order]
+        if self.descending:
+            ordered = ordered[::-1]
+        return bool(np.all(ordered[:-1] <= ordered[1:])) if len(ordered) > 1 else True
+
+    def in_place(self, row):
+        """Return True when a proxy row is still ordered relative to its neighbours."""
+        key = self.sort_keys[self.order[row]]
+        before = self.sort_keys[self.order[row - 1]] if row > 0 else None
+        after = self.sort_keys[self.order[row + 1]] if row + 1 < len(self.order) else None
+        if self.descending:
+            before, after = after, before
+        return (before is None or before <= key) and (after is None or key <= after)
+
+    def reposition_row(self, source_row):
+        """Move one row whose sort key changed to its new place."""
+        old = int(self.position[source_row])
+        if self.in_place(old):
+            return
+        remaining = np.delete(self.order, old)
+        ordered = self.sort_keys[remaining]
+        key = self.sort_keys[source_row]
+        if self.descending:
+            new = len(ordered) - int(np.searchsorted(ordered[::-1], key, side="left"))
+        else:
+            new = int(np.searchsorted(ordered, key, side="right"))
+        if new == old:
+            return
+        # Qt's destination row is expressed in the indexing before the move
+        destination = new if new < old else new + 1
+        self.beginMoveRows(QModelIndex(), old, old, QModelIndex(), destination)
+        self.order = np.insert(remaining, new, source_row)
+        self.update_positions(min(old, new), max(old, new) + 1)
+        self.endMoveRows()
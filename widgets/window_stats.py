@@ -0,0 +1,73 @@
+import math
+from collections import deque
+
+
+class SlidingWindowStats:
+    def __init__(self, size, fill=None):
+        """
+        Minimum, maximum and mean of the last `size` values, updated in O(1)
+        amortized time per value.
+
+        Minimum and maximum come from monotonic deques of (index, value); the
+        mean from a running sum that is re-added from scratch once per window
+        to keep floating-point drift bounded.
+
+        Args:
+            size (int): Number of most recent values covered.
+            fill (float): Start with a full window of this value (optional).
+        """
+        self.size = max(1, int(size))
+        self._values = deque(maxlen=self.size)
+        self._max = deque()
+        self._min = deque()
+        self._sum = 0.0
+        self._index = 0
+        if fill is not None:
+            # The state `size` pushes of `fill` would leave, built directly
+            fill = float(fill)
+            self._values.extend([fill] * self.size)
+            self._max.append((self.size - 1, fill))
+            self._min.append((self.size - 1, fill))
+            self._sum = fill * self.size
+            self._index = self.size
+
+    def __len__(self):
+        return len(self._values)
+
+    def push(self, value):
+        """Add a value, dropping the oldest one once the window is full."""
+        value = float(value)
+        if len(self._values) == self.size:
+            self._sum -= self._values[0]
+        self._values.append(value)
+        self._sum += value
+
+        index = self._index
+        self._index += 1
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((index, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((index, value))
+
+        oldest = index - self.size + 1
+        if self._max[0][0] < oldest:
+            self._max.popleft()
+        if self._min[0][0] < oldest:
+            self._min.popleft()
+
+        if self._index % self.size == 0:
+            self._sum = math.fsum(self._values)
+
+    @property
+    def maximum(self):
+        return self._max[0][1] if self._max else None
+
+    @property
+    def minimum(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def mean(self):
+        return self._sum / len(self._values) if self._values else None
@@ -0,0 +1,36 @@
+from PySide6.QtCore import QRunnable
+
+
+class FetchWorker(QRunnable):
+    def __init__(self, task, result_signal=None, error_signal=None):
+        """
+        Run a data-fetching task on a QThreadPool.
+
+        The task runs on a pool thread; its return value is emitted through
+        `result_signal`, which the owning widget connects with a queued
+        connection so the result is handled back on the GUI thread.
+
+        Args:
+            task (callable): Zero-argument callable doing the blocking work.
+            result_signal (SignalInstance): Signal emitted with the task result (optional).
+            error_signal (SignalInstance): Signal emitted with an error message (optional).
+        """
+        super().__init__()
+        self.task = task
+        self.result_signal = result_signal
+        self.error_signal = error_signal
+
+    def run(self):
+        """Execute the task and emit its result."""
+        try:
+            try:
+                result = self.task()
+            except Exception as e:
+                if self.error_signal is not None:
+                    self.error_signal.emit(str(e))
+                return
+            if self.result_signal is not None:
+                self.result_signal.emit(result)
+        except RuntimeError:
+            # The receiving widget was destroyed while the task was running
+            pass